@@ -16,24 +16,21 @@ Learning Goals:
 - Master lighting intensity and color
 """
 
-import mitsuba as mi
-import matplotlib.pyplot as plt
-import os
+import functools
+import time
 
-mi.set_variant('scalar_rgb')
 
-print("Lighting Techniques Demo")
-print("=" * 50)
+@functools.lru_cache(maxsize=None)
+def static_scene_parts():
+    """Static scene parts, built once and shared by every lighting setup"""
+    import mitsuba as mi
 
-def create_scene_with_lighting(light_config, title):
-    """Helper function to create a scene with specific lighting"""
-    
-    base_scene = {
-        'type': 'scene',
+    return {
         'integrator': {
             'type': 'path',
             'max_depth': 6,
         },
+
         'sensor': {
             'type': 'perspective',
             'fov': 45,
@@ -53,7 +50,7 @@ def create_scene_with_lighting(light_config, title):
                 up=[0, 1, 0]
             ),
         },
-        
+
         # Main sphere
         'sphere': {
             'type': 'sphere',
@@ -63,7 +60,7 @@ def create_scene_with_lighting(light_config, title):
             },
             'to_world': mi.ScalarTransform4f.translate([0, 0, 0]).scale(1.0)
         },
-        
+
         # Ground
         'ground': {
             'type': 'rectangle',
@@ -75,7 +72,7 @@ def create_scene_with_lighting(light_config, title):
                                              .rotate([1, 0, 0], -90)
                                              .scale(8)
         },
-        
+
         # Back wall
         'wall': {
             'type': 'rectangle',
@@ -87,207 +84,235 @@ def create_scene_with_lighting(light_config, title):
                                              .scale(8)
         },
     }
-    
-    # Add the specific light configuration
-    base_scene.update(light_config)
-    
-    return base_scene, title
-
-
-# Define different lighting setups
-lighting_configs = [
-    # 1. Single point light
-    (
-        {
-            'light1': {
-                'type': 'point',
-                'intensity': {'type': 'spectrum', 'value': 80.0},
-                'position': [3, 4, 4],
-            }
-        },
-        "Point Light (Hard Shadows)"
-    ),
-    
-    # 2. Area light (soft shadows)
-    (
-        {
-            'area_light': {
-                'type': 'rectangle',
-                'emitter': {
-                    'type': 'area',
-                    'radiance': {'type': 'rgb', 'value': [15, 15, 15]},
-                },
-                'to_world': mi.ScalarTransform4f.translate([2, 4, 3])
-                                                 .rotate([1, 0, 0], -45)
-                                                 .scale(2)
-            }
-        },
-        "Area Light (Soft Shadows)"
-    ),
-    
-    # 3. Directional light (sun)
-    (
-        {
-            'sun': {
-                'type': 'directional',
-                'direction': [-1, -1, -1],
-                'irradiance': {'type': 'rgb', 'value': [3, 3, 3]},
-            }
-        },
-        "Directional Light (Sun)"
-    ),
-    
-    # 4. Three-point lighting (professional)
-    (
-        {
-            'key_light': {  # Main light
-                'type': 'point',
-                'intensity': {'type': 'spectrum', 'value': 60.0},
-                'position': [4, 4, 4],
+
+
+def create_scene_with_lighting(light_config, title):
+    """Helper function to create a scene with specific lighting"""
+    return {'type': 'scene', **static_scene_parts(), **light_config}, title
+
+
+def point_lights(*lights):
+    """Build a point-light config from (rgb_intensity, position) pairs"""
+    return {
+        f'point_{slot}': {
+            'type': 'point',
+            'intensity': {'type': 'rgb', 'value': intensity},
+            'position': position,
+        }
+        for slot, (intensity, position) in enumerate(lights)
+    }
+
+
+def main():
+    """Render every lighting setup and build the comparison grid"""
+    # Heavy imports stay inside main() so importing this file is cheap
+    import mitsuba as mi
+    import drjit as dr
+    import numpy as np
+    from PIL import Image, ImageDraw, ImageFont
+
+    import demo_common  # Sets the best available variant
+
+    print("Lighting Techniques Demo")
+    print("=" * 50)
+
+    # Define different lighting setups
+    lighting_configs = [
+        # 1. Single point light
+        (
+            point_lights(
+                ([80, 80, 80], [3, 4, 4]),
+            ),
+            "Point Light (Hard Shadows)"
+        ),
+
+        # 2. Area light (soft shadows)
+        (
+            {
+                'area_light': {
+                    'type': 'rectangle',
+                    'emitter': {
+                        'type': 'area',
+                        'radiance': {'type': 'rgb', 'value': [15, 15, 15]},
+                    },
+                    'to_world': mi.ScalarTransform4f.translate([2, 4, 3])
+                                                     .rotate([1, 0, 0], -45)
+                                                     .scale(2)
+                }
             },
-            'fill_light': {  # Fill shadows
-                'type': 'point',
-                'intensity': {'type': 'spectrum', 'value': 20.0},
-                'position': [-3, 2, 3],
+            "Area Light (Soft Shadows)"
+        ),
+
+        # 3. Directional light (sun)
+        (
+            {
+                'sun': {
+                    'type': 'directional',
+                    'direction': [-1, -1, -1],
+                    'irradiance': {'type': 'rgb', 'value': [3, 3, 3]},
+                }
             },
-            'back_light': {  # Rim lighting
-                'type': 'point',
-                'intensity': {'type': 'spectrum', 'value': 30.0},
-                'position': [0, 3, -3],
-            }
-        },
-        "Three-Point Lighting"
-    ),
-    
-    # 5. Environment lighting
-    (
-        {
-            'env': {
-                'type': 'envmap',
-                'filename': None,  # We'll use constant
-                'emitter': {
+            "Directional Light (Sun)"
+        ),
+
+        # 4. Three-point lighting (professional)
+        (
+            point_lights(
+                ([60, 60, 60], [4, 4, 4]),   # Key light: main illumination
+                ([20, 20, 20], [-3, 2, 3]),  # Fill light: softens shadows
+                ([30, 30, 30], [0, 3, -3]),  # Back light: rim lighting
+            ),
+            "Three-Point Lighting"
+        ),
+
+        # 5. Environment lighting
+        (
+            {
+                'env': {
+                    'type': 'envmap',
+                    'filename': None,  # We'll use constant
+                    'emitter': {
+                        'type': 'constant',
+                        'radiance': {'type': 'rgb', 'value': [1.5, 1.5, 1.5]},
+                    }
+                }
+            },
+            "Environment Lighting"
+        ),
+
+        # 6. Colored lights
+        (
+            point_lights(
+                ([100, 20, 20], [3, 3, 3]),   # Red
+                ([20, 20, 100], [-3, 3, 3]),  # Blue
+            ),
+            "Colored Lights (Red + Blue)"
+        ),
+    ]
+
+    print(f"\n🎬 Rendering {len(lighting_configs)} lighting setups...")
+    print("   This will take 2-3 minutes total...")
+
+    raw_images = []
+    titles = []
+
+    # Record launched kernels so we can confirm the compiled kernel gets reused
+    use_jit = not mi.variant().startswith('scalar')
+    if use_jit:
+        dr.set_flag(dr.JitFlag.KernelHistory, True)
+
+    # Trace all renders without evaluating them (mi.render() would launch and
+    # wait for each one), then launch every kernel in a single dr.eval()
+    start = time.time()
+    for i, (light_config, title) in enumerate(lighting_configs, 1):
+        print(f"\n   [{i}/{len(lighting_configs)}] {title}...")
+
+        # Handle environment map specially
+        if 'env' in light_config and light_config['env']['filename'] is None:
+            # For constant environment, simplify
+            light_config = {
+                'constant_emitter': {
                     'type': 'constant',
                     'radiance': {'type': 'rgb', 'value': [1.5, 1.5, 1.5]},
                 }
             }
-        },
-        "Environment Lighting"
-    ),
-    
-    # 6. Colored lights
-    (
-        {
-            'light_red': {
-                'type': 'point',
-                'intensity': {'type': 'rgb', 'value': [100, 20, 20]},  # Red
-                'position': [3, 3, 3],
-            },
-            'light_blue': {
-                'type': 'point',
-                'intensity': {'type': 'rgb', 'value': [20, 20, 100]},  # Blue
-                'position': [-3, 3, 3],
-            }
-        },
-        "Colored Lights (Red + Blue)"
-    ),
-]
-
-print(f"\n🎬 Rendering {len(lighting_configs)} lighting setups...")
-print("   This will take 2-3 minutes total...")
-
-output_dir = 'output'
-os.makedirs(output_dir, exist_ok=True)
-
-images = []
-titles = []
-
-for i, (light_config, title) in enumerate(lighting_configs, 1):
-    print(f"\n   [{i}/{len(lighting_configs)}] {title}...")
-    
-    # Handle environment map specially
-    if 'env' in light_config and light_config['env']['filename'] is None:
-        # For constant environment, simplify
-        scene_dict, scene_title = create_scene_with_lighting({}, title)
-        scene_dict['constant_emitter'] = {
-            'type': 'constant',
-            'radiance': {'type': 'rgb', 'value': [1.5, 1.5, 1.5]},
-        }
-    else:
-        scene_dict, scene_title = create_scene_with_lighting(light_config, title)
-    
-    scene = mi.load_dict(scene_dict)
-    image = mi.render(scene, spp=64)
-    
-    images.append(mi.util.convert_to_bitmap(image))
-    titles.append(scene_title)
-    
-    # Save individual image
-    filename = f"03_lighting_{i:02d}_{title.lower().replace(' ', '_').replace('(', '').replace(')', '')}.png"
-    mi.util.write_bitmap(os.path.join(output_dir, filename), image)
-
-print("\n✅ All renders complete!")
-
-# Create comparison grid
-fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-axes = axes.flatten()
-
-for idx, (img, title) in enumerate(zip(images, titles)):
-    axes[idx].imshow(img)
-    axes[idx].axis('off')
-    axes[idx].set_title(title, fontsize=14, fontweight='bold')
-
-plt.suptitle('Lighting Techniques Comparison', fontsize=20, fontweight='bold')
-plt.tight_layout()
-
-comparison_path = os.path.join(output_dir, '03_lighting_comparison.png')
-plt.savefig(comparison_path, dpi=150, bbox_inches='tight')
-print(f"\n💾 Comparison grid saved to: {comparison_path}")
-
-plt.show()
-
-# Print explanations
-print("\n" + "=" * 50)
-print("🎓 Lighting Types Explained:")
-print("\n1. POINT LIGHT")
-print("   • Emits light in all directions from a single point")
-print("   • Creates hard, sharp shadows")
-print("   • Like: bare light bulb, candle")
-print("   • Properties: intensity, position")
-print("\n2. AREA LIGHT")
-print("   • Light emitted from a surface area")
-print("   • Creates soft, realistic shadows")
-print("   • Like: softbox, window, LED panel")
-print("   • Properties: radiance, shape, size")
-print("\n3. DIRECTIONAL LIGHT")
-print("   • Parallel rays from infinity (sun-like)")
-print("   • Consistent shadow direction")
-print("   • Like: sunlight, moonlight")
-print("   • Properties: direction, irradiance")
-print("\n4. THREE-POINT LIGHTING")
-print("   • Key light: main illumination (brightest)")
-print("   • Fill light: softens shadows (dimmer)")
-print("   • Back light: rim lighting, separation from background")
-print("   • Professional photography/cinematography standard")
-print("\n5. ENVIRONMENT LIGHTING")
-print("   • Light coming from all directions (sky dome)")
-print("   • Can use HDRI images for realistic outdoor lighting")
-print("   • Soft, ambient illumination")
-print("   • Properties: radiance map or constant value")
-print("\n6. COLORED LIGHTS")
-print("   • Lights can have any RGB color")
-print("   • Creates dramatic color mixing")
-print("   • Used for artistic effects, mood lighting")
-print("   • Properties: RGB intensity values")
-print("\n💡 Lighting Tips:")
-print("   • More light sources = softer overall lighting")
-print("   • Area lights = realistic soft shadows (but slower to render)")
-print("   • Point lights = fast rendering, hard shadows")
-print("   • Three-point lighting = professional look")
-print("   • Color temperature: warm (orange) vs cool (blue)")
-print("\n🔧 Try Experimenting:")
-print("   • Change light positions")
-print("   • Adjust intensity values")
-print("   • Mix different light types")
-print("   • Add more lights to a scene")
-print("   • Change light colors for mood")
-print("=" * 50)
+
+        # Every setup has its own set of emitters, so each needs its own scene;
+        # they are cached by content, so calling main() again skips the loads
+        scene_dict = create_scene_with_lighting(light_config, title)[0]
+        scene = demo_common.get_scene(demo_common.scene_key(scene_dict), lambda: scene_dict)
+
+        raw_images.append(scene.integrator().render(
+            scene, scene.sensors()[0], spp=64, evaluate=False))
+        titles.append(title)
+
+    dr.eval(*raw_images)
+    dr.sync_thread()
+
+    if use_jit:
+        history = dr.kernel_history()
+        cache_hits = sum(1 for kernel in history if kernel.get('cache_hit'))
+        print(f"\n   kernels launched: {len(history)}, cache hits: {cache_hits}")
+
+    print(f"\n✅ All renders complete in {time.time() - start:.2f}s (variant: {mi.variant()})")
+
+    # Comparison grid: 2 rows x 3 columns, each render written straight into its tile
+    film = static_scene_parts()['sensor']['film']
+    H, W = film['height'], film['width']
+    grid = np.empty((2 * H, 3 * W, 3), dtype=np.uint8)
+
+    for i, (image, title) in enumerate(zip(raw_images, titles), 1):
+        row, col = divmod(i - 1, 3)
+        tile = grid[row * H:(row + 1) * H, col * W:(col + 1) * W]
+        demo_common.to_ldr(image, out=tile)
+
+        # Save individual image
+        filename = f"03_lighting_{i:02d}_{title.lower().replace(' ', '_').replace('(', '').replace(')', '')}.png"
+        demo_common.save_ldr(tile, demo_common.output_path(filename))
+
+    # Bake the titles into the grid
+    comparison = Image.fromarray(grid)
+    draw = ImageDraw.Draw(comparison)
+    font = ImageFont.load_default()
+    for idx, title in enumerate(titles):
+        row, col = divmod(idx, 3)
+        draw.text((col * W + 12, row * H + 12), title, font=font,
+                  fill=(255, 255, 255), stroke_width=2, stroke_fill=(0, 0, 0))
+
+    comparison_path = demo_common.output_path('03_lighting_comparison.png')
+    comparison.save(comparison_path, compress_level=1)
+    print(f"\n💾 Comparison grid saved to: {comparison_path}")
+
+    if demo_common.PREVIEW and demo_common.has_display():
+        comparison.show()
+
+    # Print explanations
+    print("\n" + "=" * 50)
+    print("🎓 Lighting Types Explained:")
+    print("\n1. POINT LIGHT")
+    print("   • Emits light in all directions from a single point")
+    print("   • Creates hard, sharp shadows")
+    print("   • Like: bare light bulb, candle")
+    print("   • Properties: intensity, position")
+    print("\n2. AREA LIGHT")
+    print("   • Light emitted from a surface area")
+    print("   • Creates soft, realistic shadows")
+    print("   • Like: softbox, window, LED panel")
+    print("   • Properties: radiance, shape, size")
+    print("\n3. DIRECTIONAL LIGHT")
+    print("   • Parallel rays from infinity (sun-like)")
+    print("   • Consistent shadow direction")
+    print("   • Like: sunlight, moonlight")
+    print("   • Properties: direction, irradiance")
+    print("\n4. THREE-POINT LIGHTING")
+    print("   • Key light: main illumination (brightest)")
+    print("   • Fill light: softens shadows (dimmer)")
+    print("   • Back light: rim lighting, separation from background")
+    print("   • Professional photography/cinematography standard")
+    print("\n5. ENVIRONMENT LIGHTING")
+    print("   • Light coming from all directions (sky dome)")
+    print("   • Can use HDRI images for realistic outdoor lighting")
+    print("   • Soft, ambient illumination")
+    print("   • Properties: radiance map or constant value")
+    print("\n6. COLORED LIGHTS")
+    print("   • Lights can have any RGB color")
+    print("   • Creates dramatic color mixing")
+    print("   • Used for artistic effects, mood lighting")
+    print("   • Properties: RGB intensity values")
+    print("\n💡 Lighting Tips:")
+    print("   • More light sources = softer overall lighting")
+    print("   • Area lights = realistic soft shadows (but slower to render)")
+    print("   • Point lights = fast rendering, hard shadows")
+    print("   • Three-point lighting = professional look")
+    print("   • Color temperature: warm (orange) vs cool (blue)")
+    print("\n🔧 Try Experimenting:")
+    print("   • Change light positions")
+    print("   • Adjust intensity values")
+    print("   • Mix different light types")
+    print("   • Add more lights to a scene")
+    print("   • Change light colors for mood")
+    print("=" * 50)
+
+
+if __name__ == '__main__':
+    main()
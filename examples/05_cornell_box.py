@@ -19,208 +19,11 @@ Learning Goals:
 - Classic computer graphics reference scene
 """
 
-import mitsuba as mi
-import matplotlib.pyplot as plt
-import os
-
-mi.set_variant('scalar_rgb')
-
-print("Cornell Box Demo")
-print("=" * 50)
-print("Rendering the famous Cornell Box...")
-print("This scene demonstrates global illumination!\n")
-
-# The Cornell Box dimensions (standard)
-# All coordinates are relative to a unit box
-scene_dict = {
-    'type': 'scene',
-    
-    # Path tracer is essential for global illumination
-    'integrator': {
-        'type': 'path',
-        'max_depth': 8,  # Need several bounces to see color bleeding
-    },
-    
-    'sensor': {
-        'type': 'perspective',
-        'fov': 39.3,  # Matches original Cornell Box camera
-        'film': {
-            'type': 'hdrfilm',
-            'width': 512,
-            'height': 512,
-            'rfilter': {'type': 'gaussian'},
-        },
-        'sampler': {
-            'type': 'independent',
-            'sample_count': 256,  # High quality for clean indirect lighting
-        },
-        # Camera looking into the box
-        'to_world': mi.ScalarTransform4f.look_at(
-            origin=[0, 1, 6.8],   # Looking into the box
-            target=[0, 1, 0],
-            up=[0, 1, 0]
-        ),
-    },
-    
-    # Back wall - white
-    'back_wall': {
-        'type': 'rectangle',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.73, 0.73, 0.73]},
-        },
-        'to_world': mi.ScalarTransform4f.translate([0, 1, -1.99])
-                                         .scale(2)
-    },
-    
-    # Floor - white
-    'floor': {
-        'type': 'rectangle',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.73, 0.73, 0.73]},
-        },
-        'to_world': mi.ScalarTransform4f.translate([0, -1, 0])
-                                         .rotate([1, 0, 0], -90)
-                                         .scale(2)
-    },
-    
-    # Ceiling - white
-    'ceiling': {
-        'type': 'rectangle',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.73, 0.73, 0.73]},
-        },
-        'to_world': mi.ScalarTransform4f.translate([0, 3, 0])
-                                         .rotate([1, 0, 0], -90)
-                                         .scale(2)
-    },
-    
-    # Left wall - RED (this is key for color bleeding!)
-    'left_wall': {
-        'type': 'rectangle',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.63, 0.065, 0.05]},  # Red
-        },
-        'to_world': mi.ScalarTransform4f.translate([2, 1, 0])
-                                         .rotate([0, 1, 0], -90)
-                                         .scale(2)
-    },
-    
-    # Right wall - GREEN (opposite colored wall)
-    'right_wall': {
-        'type': 'rectangle',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.14, 0.45, 0.091]},  # Green
-        },
-        'to_world': mi.ScalarTransform4f.translate([-2, 1, 0])
-                                         .rotate([0, 1, 0], 90)
-                                         .scale(2)
-    },
-    
-    # Tall box - white
-    'tall_box': {
-        'type': 'cube',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.73, 0.73, 0.73]},
-        },
-        'to_world': mi.ScalarTransform4f.translate([-0.7, -0.15, -0.5])
-                                         .rotate([0, 1, 0], -18)
-                                         .scale([0.6, 1.65, 0.6])
-    },
-    
-    # Short box - white
-    'short_box': {
-        'type': 'cube',
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0.73, 0.73, 0.73]},
-        },
-        'to_world': mi.ScalarTransform4f.translate([0.7, -0.6, 0.5])
-                                         .rotate([0, 1, 0], 16)
-                                         .scale([0.6, 0.8, 0.6])
-    },
-    
-    # Area light on ceiling - this is crucial!
-    # The area light creates soft shadows and enables global illumination
-    'area_light': {
-        'type': 'rectangle',
-        'emitter': {
-            'type': 'area',
-            'radiance': {'type': 'rgb', 'value': [18.4, 15.6, 8.0]},  # Slightly warm white
-        },
-        'bsdf': {
-            'type': 'diffuse',
-            'reflectance': {'type': 'rgb', 'value': [0, 0, 0]},  # Black (doesn't reflect)
-        },
-        # Small light in center of ceiling
-        'to_world': mi.ScalarTransform4f.translate([0, 2.99, 0])
-                                         .rotate([1, 0, 0], -90)
-                                         .scale(0.5)
-    },
-}
-
-print("📦 Cornell Box components:")
-print("   • 5 walls (back, floor, ceiling, left red, right green)")
-print("   • 2 white boxes (tall and short)")
-print("   • 1 area light (ceiling)")
-print("\n🎨 The magic:")
-print("   • Red wall bounces red light onto nearby objects")
-print("   • Green wall bounces green light onto nearby objects")
-print("   • Area light creates soft, realistic shadows")
-print("   • Multiple light bounces = global illumination")
-
-print("\n🎬 Rendering Cornell Box...")
-print("   Resolution: 512x512")
-print("   Samples per pixel: 256")
-print("   Max bounces: 8")
-print("   ⏱️  This will take 1-2 minutes...")
-
-scene = mi.load_dict(scene_dict)
-image = mi.render(scene, spp=256)
-
-print("✅ Rendering complete!")
-
-# Save output
-output_dir = 'output'
-os.makedirs(output_dir, exist_ok=True)
-
-output_path = os.path.join(output_dir, '05_cornell_box.png')
-mi.util.write_bitmap(output_path, image)
-print(f"\n💾 Image saved to: {output_path}")
-
-# Create detailed visualization
-fig = plt.figure(figsize=(16, 12))
-
-# Main render
-ax1 = plt.subplot(2, 2, (1, 2))
-ax1.imshow(mi.util.convert_to_bitmap(image))
-ax1.axis('off')
-ax1.set_title('Cornell Box - Global Illumination Demo', fontsize=18, fontweight='bold', pad=20)
-
-# Add annotations for color bleeding
-from matplotlib.patches import Circle, FancyBboxPatch
-# Highlight red color bleeding on tall box (left side)
-circle1 = Circle((128, 300), 30, fill=False, edgecolor='red', linewidth=3)
-ax1.add_patch(circle1)
-ax1.text(128, 360, 'Red color\nbleeding', ha='center', color='red', 
-         fontweight='bold', fontsize=10, bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-# Highlight green color bleeding on short box (right side)
-circle2 = Circle((384, 380), 30, fill=False, edgecolor='green', linewidth=3)
-ax1.add_patch(circle2)
-ax1.text(384, 440, 'Green color\nbleeding', ha='center', color='green', 
-         fontweight='bold', fontsize=10, bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
-
-# Explanation panel
-ax2 = plt.subplot(2, 2, 3)
-ax2.axis('off')
-
-explanation = """
+import argparse
+import functools
+
+# Panels for the annotated image
+EXPLANATION = """
 🎓 WHAT IS THE CORNELL BOX?
 
 Created in 1984 at Cornell University to test
@@ -249,15 +52,7 @@ physically-based rendering algorithms.
    (unlike point lights with hard shadows)
 """
 
-ax2.text(0.05, 0.95, explanation, transform=ax2.transAxes,
-         fontsize=11, verticalalignment='top', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.3))
-
-# Technical details panel
-ax3 = plt.subplot(2, 2, 4)
-ax3.axis('off')
-
-technical = """
+TECHNICAL = """
 ⚙️ TECHNICAL DETAILS:
 
 LIGHT TRANSPORT:
@@ -271,8 +66,9 @@ Each bounce carries color information!
 
 RENDER SETTINGS:
 • Path tracer integrator
-• 8 maximum bounces
-• 256 samples per pixel
+• 5 maximum bounces (Russian roulette from 3)
+• 16 samples per pixel preview, 64 with --quality final
+• Multi-jittered (stratified) sampler
 • Diffuse (Lambertian) materials
 • Area light for soft illumination
 
@@ -291,36 +87,255 @@ WHAT TO LOOK FOR:
 👁️ Gradual light falloff
 """
 
-ax3.text(0.05, 0.95, technical, transform=ax3.transAxes,
-         fontsize=10, verticalalignment='top', fontfamily='monospace',
-         bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.3))
-
-plt.tight_layout()
-
-annotated_path = os.path.join(output_dir, '05_cornell_box_annotated.png')
-plt.savefig(annotated_path, dpi=150, bbox_inches='tight')
-print(f"💾 Annotated version saved to: {annotated_path}")
-
-plt.show()
-
-print("\n" + "=" * 50)
-print("🎓 Understanding Global Illumination:")
-print("\n   Without global illumination (direct lighting only):")
-print("   • Boxes would be pure white")
-print("   • Hard black shadows")
-print("   • Unrealistic appearance")
-print("\n   With global illumination (what you see here):")
-print("   • Color bleeding from walls")
-print("   • Soft, realistic shadows")
-print("   • Ambient lighting in shadowed areas")
-print("   • Natural, photorealistic look")
-print("\n💡 Experiment:")
-print("   • Try max_depth=1 (direct lighting only) - see the difference!")
-print("   • Change wall colors")
-print("   • Move or resize the boxes")
-print("   • Adjust light intensity")
-print("   • Try different sample counts (16, 64, 512)")
-print("\n📚 Historical Note:")
-print("   The Cornell Box is to rendering what 'Hello World' is to")
-print("   programming - a standard test that everyone uses!")
-print("=" * 50)
+# Samples per pixel for each --quality level
+QUALITY_SPP = {'preview': 16, 'final': 64}
+
+# Lowest spp that uses the Gaussian reconstruction filter
+GAUSSIAN_MIN_SPP = 64
+
+# Samples per pixel rendered by each progressive pass
+PASS_SPP = 32
+
+
+@functools.lru_cache(maxsize=None)
+def scene_transforms():
+    """Every to_world transform of the scene, composed once per process"""
+    import mitsuba as mi
+
+    T = mi.ScalarTransform4f
+    return {
+        'sensor': T.look_at(origin=[0, 1, 6.8], target=[0, 1, 0], up=[0, 1, 0]),
+        'back_wall': T.translate([0, 1, -1.99]).scale(2),
+        'floor': T.translate([0, -1, 0]).rotate([1, 0, 0], -90).scale(2),
+        'ceiling': T.translate([0, 3, 0]).rotate([1, 0, 0], -90).scale(2),
+        'left_wall': T.translate([2, 1, 0]).rotate([0, 1, 0], -90).scale(2),
+        'right_wall': T.translate([-2, 1, 0]).rotate([0, 1, 0], 90).scale(2),
+        'tall_box': T.translate([-0.7, -0.15, -0.5]).rotate([0, 1, 0], -18).scale([0.6, 1.65, 0.6]),
+        'short_box': T.translate([0.7, -0.6, 0.5]).rotate([0, 1, 0], 16).scale([0.6, 0.8, 0.6]),
+        'area_light': T.translate([0, 2.99, 0]).rotate([1, 0, 0], -90).scale(0.5),
+    }
+
+
+def parse_args():
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Render the Cornell box")
+    parser.add_argument('--spp', type=int, default=None,
+                        help="samples per pixel (overrides --quality)")
+    parser.add_argument('--quality', choices=sorted(QUALITY_SPP), default='preview',
+                        help="preview: {preview} spp, final: {final} spp".format(**QUALITY_SPP))
+    parser.add_argument('--width', type=int, default=None, help="image width (default: 512)")
+    parser.add_argument('--height', type=int, default=None, help="image height (default: 512)")
+    parser.add_argument('--annotate', action='store_true',
+                        help="also save an annotated image with explanations")
+    return parser.parse_args()
+
+
+def main(spp=16, width=None, height=None, annotate=False):
+    """Render the Cornell box, optionally with an annotated copy"""
+    width = width or 512
+    height = height or 512
+
+    # Heavy imports stay inside main() so importing this file is cheap
+    import mitsuba as mi
+
+    import demo_common  # Sets the best available variant (GPU first)
+
+    print("Cornell Box Demo")
+    print("=" * 50)
+    print("Rendering the famous Cornell Box...")
+    print("This scene demonstrates global illumination!\n")
+
+    # Below 64 spp noise hides the Gaussian's smoothing; the box filter
+    # splats each sample into a single pixel
+    rfilter = 'gaussian' if spp >= GAUSSIAN_MIN_SPP else 'box'
+
+    # Transforms are composed once, even when main() is called repeatedly
+    xf = scene_transforms()
+
+    # The Cornell Box dimensions (standard)
+    # All coordinates are relative to a unit box
+    scene_dict = {
+        'type': 'scene',
+
+        # Path tracer is essential for global illumination
+        'integrator': {
+            'type': 'path',
+            'max_depth': 5,  # Need several bounces to see color bleeding
+            'rr_depth': 3,   # Russian roulette ends dim paths early (unbiased)
+        },
+
+        'sensor': {
+            'type': 'perspective',
+            'fov': 39.3,  # Matches original Cornell Box camera
+            'film': {
+                'type': 'hdrfilm',
+                'width': width,
+                'height': height,
+                'rfilter': {'type': rfilter},
+            },
+            # Sample count comes from mi.render(spp=...), so it stays out of the
+            # dict (and the scene cache key)
+            'sampler': {
+                # Multi-jittered (stratified) samples: less noise than independent
+                # ones at the same spp on the smooth diffuse lighting
+                'type': 'multijitter',
+            },
+            # Camera looking into the box
+            'to_world': xf['sensor'],
+        },
+
+        # One white BSDF shared by every white surface (referenced by id)
+        'white_diffuse': {
+            'type': 'diffuse',
+            'reflectance': {'type': 'rgb', 'value': [0.73, 0.73, 0.73]},
+        },
+
+        # Back wall - white
+        'back_wall': {
+            'type': 'rectangle',
+            'bsdf': {'type': 'ref', 'id': 'white_diffuse'},
+            'to_world': xf['back_wall']
+        },
+
+        # Floor - white
+        'floor': {
+            'type': 'rectangle',
+            'bsdf': {'type': 'ref', 'id': 'white_diffuse'},
+            'to_world': xf['floor']
+        },
+
+        # Ceiling - white
+        'ceiling': {
+            'type': 'rectangle',
+            'bsdf': {'type': 'ref', 'id': 'white_diffuse'},
+            'to_world': xf['ceiling']
+        },
+
+        # Left wall - RED (this is key for color bleeding!)
+        'left_wall': {
+            'type': 'rectangle',
+            'bsdf': {
+                'type': 'diffuse',
+                'reflectance': {'type': 'rgb', 'value': [0.63, 0.065, 0.05]},  # Red
+            },
+            'to_world': xf['left_wall']
+        },
+
+        # Right wall - GREEN (opposite colored wall)
+        'right_wall': {
+            'type': 'rectangle',
+            'bsdf': {
+                'type': 'diffuse',
+                'reflectance': {'type': 'rgb', 'value': [0.14, 0.45, 0.091]},  # Green
+            },
+            'to_world': xf['right_wall']
+        },
+
+        # Tall box - white
+        'tall_box': {
+            'type': 'cube',
+            'bsdf': {'type': 'ref', 'id': 'white_diffuse'},
+            'to_world': xf['tall_box']
+        },
+
+        # Short box - white
+        'short_box': {
+            'type': 'cube',
+            'bsdf': {'type': 'ref', 'id': 'white_diffuse'},
+            'to_world': xf['short_box']
+        },
+
+        # Area light on ceiling - this is crucial!
+        # The area light creates soft shadows and enables global illumination
+        'area_light': {
+            'type': 'rectangle',
+            'emitter': {
+                'type': 'area',
+                'radiance': {'type': 'rgb', 'value': [18.4, 15.6, 8.0]},  # Slightly warm white
+            },
+            'bsdf': {
+                'type': 'diffuse',
+                'reflectance': {'type': 'rgb', 'value': [0, 0, 0]},  # Black (doesn't reflect)
+            },
+            # Small light in center of ceiling
+            'to_world': xf['area_light']
+        },
+    }
+
+    print("📦 Cornell Box components:")
+    print("   • 5 walls (back, floor, ceiling, left red, right green)")
+    print("   • 2 white boxes (tall and short)")
+    print("   • 1 area light (ceiling)")
+    print("\n🎨 The magic:")
+    print("   • Red wall bounces red light onto nearby objects")
+    print("   • Green wall bounces green light onto nearby objects")
+    print("   • Area light creates soft, realistic shadows")
+    print("   • Multiple light bounces = global illumination")
+
+    print("\n🎬 Rendering Cornell Box...")
+    print(f"   Resolution: {width}x{height}")
+    print(f"   Samples per pixel: {spp}")
+    print("   Max bounces: 5 (Russian roulette from 3)")
+    print("   ⏱️  --quality final takes a minute or two on CPU...")
+
+    # Cached: calling main() again (e.g. with another spp) skips the scene/BVH build
+    scene = demo_common.load_scene(scene_dict)
+    # Accumulate in passes of at most 32 spp: peak sample memory follows the
+    # pass size rather than the total, and the kernel is reused by every pass
+    image = demo_common.render(scene, spp, passes=-(-spp // PASS_SPP))
+
+    print(f"✅ Rendering complete! (variant: {mi.variant()})")
+
+    # Save output (the output directory is created on demand)
+    # Tonemap once for both outputs
+    ldr = demo_common.to_ldr(image)
+
+    output_path = demo_common.output_path('05_cornell_box.png')
+    demo_common.save_ldr(ldr, output_path)
+    print(f"\n💾 Image saved to: {output_path}")
+
+    exr_path = demo_common.output_path('05_cornell_box.exr')
+    demo_common.save_exr(image, exr_path)
+    print(f"💾 HDR image saved to: {exr_path}")
+
+    if annotate:
+        # Circle the color bleeding (markers were placed on a 512x512 render)
+        sx, sy = width / 512, height / 512
+        markers = [
+            (128 * sx, 300 * sy, 30, (220, 0, 0), 'Red color\nbleeding'),
+            (384 * sx, 380 * sy, 30, (0, 150, 0), 'Green color\nbleeding'),
+        ]
+        annotated_path = demo_common.output_path('05_cornell_box_annotated.png')
+        demo_common.save_annotated(
+            ldr, annotated_path,
+            title='Cornell Box - Global Illumination Demo',
+            panels=[EXPLANATION, TECHNICAL], markers=markers)
+        print(f"💾 Annotated version saved to: {annotated_path}")
+
+    print("\n" + "=" * 50)
+    print("🎓 Understanding Global Illumination:")
+    print("\n   Without global illumination (direct lighting only):")
+    print("   • Boxes would be pure white")
+    print("   • Hard black shadows")
+    print("   • Unrealistic appearance")
+    print("\n   With global illumination (what you see here):")
+    print("   • Color bleeding from walls")
+    print("   • Soft, realistic shadows")
+    print("   • Ambient lighting in shadowed areas")
+    print("   • Natural, photorealistic look")
+    print("\n💡 Experiment:")
+    print("   • Try max_depth=1 (direct lighting only) - see the difference!")
+    print("   • Change wall colors")
+    print("   • Move or resize the boxes")
+    print("   • Adjust light intensity")
+    print("   • Try different sample counts (--spp 16, 64, 512)")
+    print("\n📚 Historical Note:")
+    print("   The Cornell Box is to rendering what 'Hello World' is to")
+    print("   programming - a standard test that everyone uses!")
+    print("=" * 50)
+
+
+if __name__ == '__main__':
+    args = parse_args()
+    main(spp=args.spp or QUALITY_SPP[args.quality], width=args.width,
+         height=args.height, annotate=args.annotate)
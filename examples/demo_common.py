@@ -0,0 +1,353 @@
+"""
+Shared helpers for the Mitsuba 3 demos
+=======================================
+
+Importing this module picks the render variant once, so every demo run in
+the same process shares one Dr.Jit backend. Loaded scenes are cached by a
+canonical key, letting repeated renders of the same scene dict skip the
+scene (and BVH) build entirely.
+
+Compiled kernels are cached on disk by Dr.Jit itself (in ~/.drjit), so
+only the first run of a demo with a given variant pays for LLVM/NVRTC
+code generation; later runs load the cached kernels. Delete that folder
+to force a recompile.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from collections import OrderedDict
+
+import numpy as np
+import mitsuba as mi
+import drjit as dr
+from PIL import Image, ImageDraw, ImageFont
+
+try:
+    from numba import njit, prange
+except ImportError:  # Optional: to_ldr() then uses Mitsuba's converter
+    njit = None
+
+# Repository-level output folder, whatever the working directory (run_all.py
+# runs the demos from examples/)
+OUTPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
+
+# Scene dicts serialized to XML, reused across runs
+SCENE_CACHE_DIR = os.path.join(OUTPUT_DIR, 'scene_cache')
+
+# Matplotlib previews are opt-in: pass --preview to any demo
+PREVIEW = '--preview' in sys.argv
+
+# Preferred variants: GPU megakernel, vectorized CPU, then scalar fallback
+VARIANT_PRIORITY = ('cuda_ad_rgb', 'llvm_ad_rgb', 'scalar_rgb')
+
+# Loaded scenes, keyed by scene_key() or any other hashable key. The least
+# recently used scene is dropped once more than SCENE_CACHE_SIZE are held
+SCENE_CACHE_SIZE = 8
+_scenes = OrderedDict()
+
+
+def pick_variant():
+    """
+    Set the first variant in VARIANT_PRIORITY that is built and usable
+
+    A variant can be compiled in but still fail to start (e.g. cuda_ad_rgb
+    on a machine without an NVIDIA driver), so each JIT variant is probed
+    with a tiny kernel before it is accepted.
+    """
+    for variant in VARIANT_PRIORITY:
+        if variant not in mi.variants():
+            continue
+        try:
+            mi.set_variant(variant)
+            if not variant.startswith('scalar'):
+                dr.eval(mi.Float(0))
+            return variant
+        except Exception as e:
+            print(f"⚠️  {variant} unavailable ({e}), trying the next variant")
+    raise RuntimeError(f"None of the variants {VARIANT_PRIORITY} could be initialized")
+
+
+def init_variant():
+    """Select the best available variant (only the first call does work)"""
+    if mi.variant() is None:
+        pick_variant()
+
+        # Keep the integrator's loops and virtual calls recorded into a single kernel
+        dr.set_flag(dr.JitFlag.LoopRecord, True)
+        dr.set_flag(dr.JitFlag.VCallRecord, True)
+
+        # Thread budget set by run_all.py when demos render concurrently
+        if os.environ.get('MI_NUM_THREADS'):
+            dr.set_thread_count(int(os.environ['MI_NUM_THREADS']))
+    return mi.variant()
+
+
+def opaque(tp, value):
+    """
+    Build a tp(value) that the JIT treats as a buffer input, not a literal
+
+    Values that change between renders (seeds, light intensities) would
+    otherwise be baked into the kernel and force a recompile each time.
+    In scalar variants this is just tp(value).
+    """
+    result = tp(value)
+    if dr.is_jit_v(result):
+        dr.make_opaque(result)
+    return result
+
+
+def scene_key(scene_dict):
+    """Canonical JSON serialization of a scene dict, usable as a cache key"""
+    return json.dumps(scene_dict, sort_keys=True, default=repr)
+
+
+def get_scene(dict_key, builder_fn):
+    """
+    Return the loaded scene for dict_key, building it on first use
+
+    Args:
+        dict_key: Hashable cache key (see scene_key())
+        builder_fn: Zero-argument callable returning the scene dict
+    """
+    return _cached_scene(dict_key, lambda: mi.load_dict(builder_fn()))
+
+
+def _cached_scene(key, load_fn):
+    """Look up key in the scene cache, loading it with load_fn() on a miss"""
+    if key in _scenes:
+        _scenes.move_to_end(key)
+    else:
+        _scenes[key] = load_fn()
+        if len(_scenes) > SCENE_CACHE_SIZE:
+            _scenes.popitem(last=False)
+    return _scenes[key]
+
+
+def load_cached(scene_dict, cache_path=None):
+    """
+    Load a scene dict through an XML file cached on disk
+
+    The first run writes the dict out with mi.xml.dict_to_xml(); later runs
+    go straight to the C++ XML parser. By default the file is named after a
+    hash of scene_key(), so editing the dict produces a new cache entry.
+    """
+    if cache_path is None:
+        digest = hashlib.sha1(scene_key(scene_dict).encode()).hexdigest()[:16]
+        cache_path = os.path.join(SCENE_CACHE_DIR, f'{digest}.xml')
+
+    if not os.path.exists(cache_path):
+        os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+        # Write to a temporary name first, so an interrupted run can't leave
+        # a truncated file at cache_path (the XML writer wants a .xml name)
+        tmp_path = f'{os.path.splitext(cache_path)[0]}.{os.getpid()}.tmp.xml'
+        try:
+            mi.xml.dict_to_xml(scene_dict, tmp_path)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            # Not every dict round-trips through XML; don't leave a broken entry
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return mi.load_dict(scene_dict)
+    try:
+        return mi.load_file(cache_path)
+    except Exception:
+        # Damaged, or written by another Mitsuba version: rebuild it next run
+        os.remove(cache_path)
+        return mi.load_dict(scene_dict)
+
+
+def load_scene(scene_dict):
+    """Load a scene dict, reusing a previously loaded identical scene"""
+    return _cached_scene(scene_key(scene_dict), lambda: load_cached(scene_dict))
+
+
+def render(scene, spp, passes=1, seeds=None):
+    """
+    Render progressively and average the passes
+
+    Each pass renders its share of the spp samples per pixel with its own
+    seed (the first spp % passes passes take one extra sample), so only one
+    pass worth of samples is in flight at a time and the compiled kernel is
+    reused. Passes are weighted by their sample count.
+    """
+    if seeds is None:
+        seeds = range(passes)
+    seeds = list(seeds)
+    base, extra = divmod(spp, len(seeds))
+
+    image = None
+    for i, seed in enumerate(seeds):
+        spp_pass = base + (i < extra)
+        if spp_pass == 0:
+            continue
+        partial = mi.render(scene, spp=spp_pass, seed=opaque(mi.UInt32, seed)) * (spp_pass / spp)
+        image = partial if image is None else image + partial
+        dr.eval(image)
+    dr.sync_thread()
+    return image
+
+
+def output_path(filename):
+    """Path inside the demo output directory (created on demand)"""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    return os.path.join(OUTPUT_DIR, filename)
+
+
+def has_display():
+    """True when plt.show() can open a window (interactive terminal with a display)"""
+    if not sys.stdout.isatty():
+        return False
+    return sys.platform in ('win32', 'darwin') or bool(
+        os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY'))
+
+
+def pyplot():
+    """
+    Import matplotlib.pyplot on demand
+
+    Only previews need matplotlib, so batch runs never pay for the import.
+    Without a display the non-interactive Agg backend is used, which skips
+    loading a GUI toolkit.
+    """
+    if not has_display():
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+if njit is not None:
+    @njit(parallel=True, cache=True, fastmath=True)
+    def _srgb_to_uint8(hdr, out):
+        """Clamp, sRGB-encode and quantize in one fused parallel pass"""
+        h, w, c = hdr.shape
+        for y in prange(h):
+            for x in range(w):
+                for k in range(c):
+                    v = min(max(hdr[y, x, k], 0.0), 1.0)
+                    if v <= 0.0031308:
+                        v = 12.92 * v
+                    else:
+                        v = 1.055 * v ** (1.0 / 2.4) - 0.055
+                    out[y, x, k] = np.uint8(v * 255.0 + 0.5)
+
+
+def to_ldr(image, out=None):
+    """
+    Tonemap a rendered image to an 8-bit sRGB NumPy array
+
+    Pass a uint8 array (or a view such as a grid tile) as out to reuse it
+    across renders instead of allocating a new one each time.
+    """
+    if njit is None:
+        ldr = np.asarray(mi.util.convert_to_bitmap(image))
+        if out is None:
+            return ldr
+        out[...] = ldr
+        return out
+    hdr = np.ascontiguousarray(image, dtype=np.float32)
+    if out is None:
+        out = np.empty(hdr.shape, dtype=np.uint8)
+    _srgb_to_uint8(hdr, out)
+    return out
+
+
+def save_ldr(ldr, out_path):
+    """Encode an 8-bit image in a single buffered PNG write"""
+    Image.fromarray(ldr).save(out_path, compress_level=1)
+
+
+def save_exr(image, out_path):
+    """
+    Write the linear HDR render as OpenEXR
+
+    Mitsuba's EXR writer compresses on all cores, and unlike the PNG the
+    file keeps values above 1.0 for later re-tonemapping.
+    """
+    mi.Bitmap(image).write(out_path)
+
+
+def save_image(image, out_path):
+    """Write a rendered image to disk"""
+    save_ldr(to_ldr(image), out_path)
+
+
+def _font(size):
+    """Monospace TrueType font if one is installed, else Pillow's default font"""
+    for name in ('DejaVuSansMono.ttf', 'Menlo.ttc', 'consola.ttf'):
+        try:
+            return ImageFont.truetype(name, size)
+        except OSError:
+            pass
+    return ImageFont.load_default()
+
+
+def _drawable(text, font):
+    """Drop characters the font cannot draw (emoji; anything non-Latin-1 for bitmap fonts)"""
+    text = re.sub('[\U00010000-\U0010ffff\u2600-\u27bf][\ufe0f]? ?', '', text)
+    if isinstance(font, ImageFont.FreeTypeFont):
+        return text
+    return text.encode('latin-1', 'ignore').decode('latin-1')
+
+
+def save_annotated(ldr, out_path, title, panels, markers=()):
+    """
+    Save a render with a title above it and text panels below, using Pillow
+
+    The render is pasted at native resolution (no resampling), which is much
+    cheaper than rasterizing a matplotlib figure.
+
+    Args:
+        ldr: 8-bit render (see to_ldr())
+        out_path: PNG path to write
+        title: Heading drawn above the render
+        panels: Texts laid out side by side below the render
+        markers: (x, y, radius, color, label) circles drawn on the render
+    """
+    pad = 16
+    title_font, text_font = _font(22), _font(13)
+    measure = ImageDraw.Draw(Image.new('RGB', (1, 1)))
+
+    panels = [_drawable(text.strip('\n'), text_font) for text in panels]
+    boxes = [measure.multiline_textbbox((0, 0), text, font=text_font) for text in panels]
+    panel_w = sum(box[2] for box in boxes) + pad * (len(boxes) + 1)
+    panel_h = max((box[3] for box in boxes), default=0) + 2 * pad
+    title = _drawable(title, title_font)
+    title_h = measure.textbbox((0, 0), title, font=title_font)[3] + 2 * pad
+
+    h, w = ldr.shape[:2]
+    canvas_w = max(w, panel_w)
+    canvas = Image.new('RGB', (canvas_w, title_h + h + panel_h), (255, 255, 255))
+    canvas.paste(Image.fromarray(ldr), ((canvas_w - w) // 2, title_h))
+
+    draw = ImageDraw.Draw(canvas)
+    title_w = draw.textbbox((0, 0), title, font=title_font)[2]
+    draw.text(((canvas_w - title_w) // 2, pad), title, font=title_font, fill=(0, 0, 0))
+
+    x0 = (canvas_w - w) // 2
+    for x, y, radius, color, label in markers:
+        cx, cy = x0 + x, title_h + y
+        draw.ellipse((cx - radius, cy - radius, cx + radius, cy + radius), outline=color, width=3)
+        label = _drawable(label, text_font)
+        label_box = draw.multiline_textbbox((0, 0), label, font=text_font, align='center')
+        draw.multiline_text((cx - label_box[2] // 2, cy + radius + 6), label, font=text_font,
+                            fill=color, align='center', stroke_width=2, stroke_fill=(255, 255, 255))
+
+    x = pad
+    for text, box in zip(panels, boxes):
+        draw.multiline_text((x, title_h + h + pad), text, font=text_font, fill=(30, 30, 30))
+        x += box[2] + pad
+
+    canvas.save(out_path, optimize=True)
+
+
+def render_and_save(scene, spp, out_path, passes=1, seeds=None):
+    """Render a scene (see render()) and write the result to out_path"""
+    image = render(scene, spp, passes=passes, seeds=seeds)
+    save_image(image, out_path)
+    return image
+
+
+init_variant()
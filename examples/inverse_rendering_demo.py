@@ -4,40 +4,267 @@ Inverse Rendering Examples - Demonstrate 2D→3D capabilities
 This script shows how to use Mitsuba 3's differentiable rendering
 for inverse problems like material estimation and shape optimization.
 
+Usage:
+    python inverse_rendering_demo.py             # one example after another
+    python inverse_rendering_demo.py --parallel  # all three concurrently
+    python inverse_rendering_demo.py --example 2 # only the second example
+
 IMPORTANT: These examples require the 'llvm_ad_rgb' or 'cuda_ad_rgb' variant!
+The scenes use the 'prb' integrator (path replay backpropagation): the
+backward pass re-traces each light path instead of storing it, so AD memory
+does not grow with the path length.
+
+When a CUDA device is present the GPU variant is used; device memory then
+stays allocated between optimization steps because the compiled kernels
+(and their buffers) are reused, and is only released after each example.
+
+The first run spends a few seconds per example compiling kernels (see the
+"Kernels compiled in" lines). Dr.Jit keeps compiled kernels in ~/.drjit,
+so later runs mostly load them from there instead.
 """
 
+import argparse
+import functools
+import os
+import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+# Differentiable variants, fastest first
+AD_VARIANTS = ('cuda_ad_rgb', 'llvm_ad_rgb')
+
+# (iterations, spp per iteration) for each example. On the GPU every step
+# pays a fixed launch cost that dwarfs a 4 spp render, so it takes fewer,
+# heavier steps; on the CPU that overhead is small and the original
+# schedule is kept
+SCHEDULES = {
+    'cuda_ad_rgb': {'albedo': (20, 16), 'position': (25, 16), 'light': (20, 16)},
+    'llvm_ad_rgb': {'albedo': (50, 4), 'position': (100, 4), 'light': (80, 4)},
+}
+
+# Camera poses (origin, target, up) of the three example scenes
+CAMERAS = {
+    'albedo': ([0, 0, 4], [0, 0, 0], [0, 1, 0]),
+    'position': ([5, 5, 3], [0, 0, 1], [0, 1, 0]),
+    'light': ([0, -5, 2], [0, 0, 1], [0, 0, 1]),
+}
+
+
+def select_variant():
+    """Set the fastest differentiable variant that is available and usable"""
+    import mitsuba as mi
+    import drjit as dr
+
+    # Already picked by an earlier example
+    if mi.variant() in AD_VARIANTS:
+        return mi.variant()
+
+    for variant in AD_VARIANTS:
+        if variant not in mi.variants():
+            continue
+        try:
+            mi.set_variant(variant)
+            # A CUDA build can still lack a driver/GPU at runtime
+            dr.eval(mi.Float(0))
+        except Exception as e:
+            print(f"⚠️  {variant} unavailable ({e}), trying the next variant")
+            continue
+        # Thread budget set by --parallel when the examples run side by side
+        if os.environ.get('MI_NUM_THREADS'):
+            dr.set_thread_count(int(os.environ['MI_NUM_THREADS']))
+        return variant
+    raise RuntimeError(f"None of the variants {AD_VARIANTS} could be initialized")
+
+
+@functools.lru_cache(maxsize=None)
+def camera_to_world(name):
+    """Sensor to_world transform for CAMERAS[name], built once per run"""
+    import mitsuba as mi
+
+    origin, target, up = CAMERAS[name]
+    return mi.ScalarTransform4f.look_at(origin=origin, target=target, up=up)
+
+
+def to_host(value):
+    """Copy a small Dr.Jit array (Float, Color3f, Point3f) to a flat NumPy array in one read"""
+    import numpy as np
+
+    return np.array(value).ravel()
+
+
+def release_memory():
+    """Wait for queued kernels, then return cached device/host allocations"""
+    import drjit as dr
+
+    dr.sync_thread()
+    dr.flush_malloc_cache()
+
+
+def set_params(params, values):
+    """
+    Write {key: value} into the traversed scene parameters and apply them
+
+    Values are converted to each parameter's own type (Color3f, Point3f,
+    Float, ...), so plain lists and numbers can be passed.
+    """
+    for key, value in values.items():
+        params[key] = type(params[key])(value)
+    params.update()
+
+
+def render_target(scene, spp, evaluate=True):
+    """
+    Render the reference image once and keep it as a plain evaluated tensor
+
+    The result is detached so no gradient can flow into it, and evaluated
+    up front so each loss computation only reads the stored pixels. This
+    also makes it safe to change the scene's parameters right afterwards.
+
+    With evaluate=False the render is only traced, to be evaluated together
+    with the warm-up render (see warm_up()). Changing material or emitter
+    values in between is safe, as they are replaced by new variables, but
+    geometry is not: the traced render would see the rebuilt shapes.
+    """
+    import mitsuba as mi
+    import drjit as dr
+
+    image = scene.integrator().render(scene, scene.sensors()[0], spp=spp, evaluate=False)
+    target_image = dr.detach(mi.TensorXf(image))
+    if evaluate:
+        dr.eval(target_image)
+    return target_image
+
+
+def loss_weights(weights):
+    """
+    Turn per-pixel weights (H x W) into a loss mask matching the RGB image
+
+    The mask is scaled to a mean of 1, so dr.mean(mask * error) is the
+    weighted average squared error and stays comparable to the plain MSE.
+    """
+    import mitsuba as mi
+    import numpy as np
+
+    weights = np.repeat(weights[..., None].astype(np.float32), 3, axis=2)
+    return mi.TensorXf(weights * (weights.size / max(weights.sum(), 1e-8)))
+
+
+def silhouette_mask(target_image, initial_image, threshold=0.05):
+    """
+    Weight only the pixels that differ between the target and initial renders
+
+    For a moving object these are its silhouettes at both positions, the
+    only pixels whose error the object's position can change.
+    """
+    import numpy as np
+
+    diff = np.abs(np.array(target_image) - np.array(initial_image)).max(axis=2)
+    return loss_weights(diff > threshold)
+
+
+def shading_mask(target_image, floor=0.1):
+    """
+    Emphasize pixels where the target's brightness changes (shading falloff)
+
+    Light position and intensity are best constrained by how the shading
+    varies across the surface; flat regions keep a small base weight.
+    """
+    import numpy as np
+
+    luminance = np.array(target_image).mean(axis=2)
+    gy, gx = np.gradient(luminance)
+    magnitude = np.hypot(gx, gy)
+    return loss_weights(floor + magnitude / max(magnitude.max(), 1e-8))
+
+
+def warm_up(scene, params, spp, pending=()):
+    """
+    Compile the forward render kernel before the optimization loop starts
+
+    Rendered with the loop's spp and an opaque seed, so the compiled kernel
+    is the one the loop's primal renders reuse. Only the forward pass is
+    prebuilt: the adjoint (backward) and Adam update kernels are still
+    compiled in the first iteration.
+
+    pending holds traced but unevaluated arrays, such as a target from
+    render_target(evaluate=False). They are evaluated by the same dr.eval()
+    as this render of the initial guess, in one round of kernel launches.
+    """
+    import time
+    import mitsuba as mi
+    import drjit as dr
+
+    start = time.time()
+    image = mi.render(scene, params, spp=spp, seed=dr.opaque(mi.UInt32, 0))
+    dr.eval(image, *pending)
+    dr.sync_thread()
+    dr.kernel_history_clear()
+    what = "Forward kernel compiled and target rendered" if pending else "Forward kernel compiled"
+    print(f"   {what} in {time.time() - start:.2f}s")
+
+
+def optimization_step(scene, params, opt, target_image, spp, seed, mask=None):
+    """
+    Run one render -> MSE -> backward -> Adam step and return the loss
+
+    With a mask (see loss_weights()) the squared error is weighted per
+    pixel, concentrating the gradient on the pixels the parameters affect.
+
+    Every iteration traces the same graph; only the seed changes, and it is
+    passed as an opaque value rather than a literal, so Dr.Jit's kernel cache
+    replays the kernels compiled in the first iteration instead of
+    compiling new ones.
+    """
+    import mitsuba as mi
+    import drjit as dr
+
+    current_image = mi.render(scene, params, spp=spp, seed=dr.opaque(mi.UInt32, seed))
+
+    # Compute loss (MSE, optionally weighted)
+    error = dr.sqr(current_image - target_image)
+    loss = dr.mean(error if mask is None else mask * error)
+
+    # Backpropagation, then the optimizer step writes back into the scene.
+    # Scheduling the loss lets it be computed by the same kernel launch that
+    # applies the Adam update, instead of a separate one when it is printed
+    dr.backward(loss)
+    dr.schedule(loss)
+    opt.step()
+    params.update(opt)
+    return loss
+
+
+@functools.lru_cache(maxsize=1)
+def available_ad_variants():
+    """Differentiable variants in this Mitsuba build (raises ImportError without Mitsuba)"""
+    import mitsuba as mi
+    return tuple(v for v in mi.variants() if '_ad_' in v)
+
+
 def check_variant():
     """Check if differentiable variant is available"""
     try:
-        import mitsuba as mi
-        variants = mi.variants()
-        
-        has_ad = any('_ad_' in v for v in variants)
-        
-        if not has_ad:
-            print("=" * 70)
-            print("⚠️  WARNING: No differentiable variants found!")
-            print("=" * 70)
-            print("\nYou need to install Mitsuba 3 with AD support:")
-            print("  pip uninstall mitsuba")
-            print("  pip install mitsuba[ad]")
-            print("\nOr build from source with AD variants enabled.")
-            print("=" * 70)
-            return False
-        
-        print("✓ Differentiable variants available:")
-        for v in variants:
-            if '_ad_' in v:
-                print(f"  - {v}")
-        return True
-        
+        ad_variants = available_ad_variants()
     except ImportError:
         print("✗ Mitsuba 3 not installed!")
         return False
+    
+    if not ad_variants:
+        print("=" * 70)
+        print("⚠️  WARNING: No differentiable variants found!")
+        print("=" * 70)
+        print("\nYou need to install Mitsuba 3 with AD support:")
+        print("  pip uninstall mitsuba")
+        print("  pip install mitsuba[ad]")
+        print("\nOr build from source with AD variants enabled.")
+        print("=" * 70)
+        return False
+    
+    print("✓ Differentiable variants available:")
+    for v in ad_variants:
+        print(f"  - {v}")
+    return True
 
 
 def example_1_optimize_albedo():
@@ -48,74 +275,29 @@ def example_1_optimize_albedo():
           recover the albedo (base color) texture.
     """
     import mitsuba as mi
-    import drjit as dr
-    import numpy as np
-    from PIL import Image
     
     print("\n" + "="*70)
     print("Example 1: Albedo Recovery from Image")
     print("="*70)
     
-    # Use AD variant
-    mi.set_variant('llvm_ad_rgb')
+    # Use the fastest AD variant
+    select_variant()
+    n_iter, spp = SCHEDULES[mi.variant()]['albedo']
+    log_every = max(1, n_iter // 5)
     
-    # Step 1: Create "ground truth" scene (what we're trying to recover)
-    print("\n1. Creating ground truth scene...")
     target_albedo = [0.8, 0.3, 0.1]  # Orange color - this is what we want to find
-    
-    target_scene = mi.load_dict({
-        'type': 'scene',
-        'integrator': {'type': 'path'},
-        'sensor': {
-            'type': 'perspective',
-            'fov': 45,
-            'to_world': mi.ScalarTransform4f.look_at(
-                origin=[0, 0, 4],
-                target=[0, 0, 0],
-                up=[0, 1, 0]
-            ),
-            'film': {
-                'type': 'hdrfilm',
-                'width': 128,
-                'height': 128,
-            }
-        },
-        'sphere': {
-            'type': 'sphere',
-            'bsdf': {
-                'type': 'diffuse',
-                'reflectance': {
-                    'type': 'rgb',
-                    'value': target_albedo  # Ground truth albedo
-                }
-            }
-        },
-        'light': {
-            'type': 'point',
-            'position': [3, 3, 3],
-            'intensity': {'type': 'spectrum', 'value': 50.0}
-        }
-    })
-    
-    # Render target image
-    print("2. Rendering target image...")
-    target_image = mi.render(target_scene, spp=64)
-    
-    # Step 2: Create optimization scene (start with wrong albedo)
-    print("3. Creating optimization scene with initial guess...")
     initial_albedo = [0.5, 0.5, 0.5]  # Gray - wrong initial guess
     
-    opt_scene = mi.load_dict({
+    # Step 1: Create the scene. The ground truth is rendered from the same
+    # scene (and BVH) by temporarily writing the target albedo into it
+    print("\n1. Creating scene with initial guess...")
+    scene = mi.load_dict({
         'type': 'scene',
-        'integrator': {'type': 'path'},
+        'integrator': {'type': 'prb', 'max_depth': 4},
         'sensor': {
             'type': 'perspective',
             'fov': 45,
-            'to_world': mi.ScalarTransform4f.look_at(
-                origin=[0, 0, 4],
-                target=[0, 0, 0],
-                up=[0, 1, 0]
-            ),
+            'to_world': camera_to_world('albedo'),
             'film': {
                 'type': 'hdrfilm',
                 'width': 128,
@@ -138,48 +320,46 @@ def example_1_optimize_albedo():
             'intensity': {'type': 'spectrum', 'value': 50.0}
         }
     })
+    params = mi.traverse(scene)
+    key = 'sphere.bsdf.reflectance.value'
+    
+    # Step 2: Render target image with the ground truth albedo
+    print("2. Rendering target image...")
+    set_params(params, {key: target_albedo})
+    # Only an albedo changes before the warm-up render, so the target can be
+    # evaluated together with it
+    target_image = render_target(scene, spp=64, evaluate=False)
+    set_params(params, {key: initial_albedo})
     
     # Step 3: Set up optimization
-    print("4. Setting up optimization...")
-    params = mi.traverse(opt_scene)
+    print("3. Setting up optimization...")
     
     # Make albedo differentiable
-    key = 'sphere.bsdf.reflectance.value'
     params.keep([key])
     
     # Optimizer
-    opt = mi.ad.Adam(lr=0.05)
+    opt = mi.ad.Adam(lr=0.05, params=params)
+    warm_up(scene, params, spp, pending=(target_image,))
     
     # Step 4: Optimization loop
-    print("5. Optimizing albedo...")
+    print("4. Optimizing albedo...")
     print(f"\n{'Iter':<8} {'Loss':<12} {'Albedo R':<10} {'Albedo G':<10} {'Albedo B':<10}")
     print("-" * 60)
     
-    for i in range(50):
-        # Render with current albedo
-        current_image = mi.render(opt_scene, params, spp=4)
-        
-        # Compute loss (MSE)
-        loss = dr.mean(dr.sqr(current_image - target_image))
-        
-        # Backpropagation
-        dr.backward(loss)
-        
-        # Optimizer step
-        opt.step(params)
-        
-        # Get current albedo value
-        current_albedo = params[key]
-        
-        # Print progress
-        if i % 10 == 0:
-            print(f"{i:<8} {loss[0]:<12.6f} {current_albedo[0]:<10.4f} {current_albedo[1]:<10.4f} {current_albedo[2]:<10.4f}")
-        
-        # Update scene
-        params.update()
+    # Progress is printed after the loop: reading values on the host inside
+    # it would wait for the device to finish every logged step
+    history = []
+    for i in range(n_iter):
+        loss = optimization_step(scene, params, opt, target_image, spp=spp, seed=i)
+        if i % log_every == 0:
+            history.append((i, loss, params[key]))
+    
+    for i, loss, current_albedo in history:
+        loss, current_albedo = to_host(loss), to_host(current_albedo)
+        print(f"{i:<8} {loss[0]:<12.6f} {current_albedo[0]:<10.4f} {current_albedo[1]:<10.4f} {current_albedo[2]:<10.4f}")
     
     # Final result
-    final_albedo = params[key]
+    final_albedo = to_host(params[key])
     print("\n" + "="*60)
     print(f"Target albedo:  [{target_albedo[0]:.4f}, {target_albedo[1]:.4f}, {target_albedo[2]:.4f}]")
     print(f"Recovered:      [{final_albedo[0]:.4f}, {final_albedo[1]:.4f}, {final_albedo[2]:.4f}]")
@@ -196,69 +376,30 @@ def example_2_optimize_position():
     Task: Given an image, recover the 3D position of an object.
     """
     import mitsuba as mi
-    import drjit as dr
-    import numpy as np
     
     print("\n" + "="*70)
     print("Example 2: 3D Position Recovery from Image")
     print("="*70)
     
-    mi.set_variant('llvm_ad_rgb')
+    select_variant()
+    n_iter, spp = SCHEDULES[mi.variant()]['position']
+    log_every = max(1, n_iter // 5)
     
-    # Ground truth position
+    # Ground truth position and the wrong initial guess
     target_pos = [1.5, 0.5, 1.0]
+    initial_pos = [0.0, 0.0, 0.5]
     
     print(f"\n1. Target position: {target_pos}")
-    
-    # Create target scene
-    target_scene = mi.load_dict({
-        'type': 'scene',
-        'integrator': {'type': 'path'},
-        'sensor': {
-            'type': 'perspective',
-            'fov': 45,
-            'to_world': mi.ScalarTransform4f.look_at(
-                origin=[5, 5, 3],
-                target=[0, 0, 1],
-                up=[0, 1, 0]
-            ),
-            'film': {'type': 'hdrfilm', 'width': 128, 'height': 128}
-        },
-        'sphere': {
-            'type': 'sphere',
-            'center': target_pos,
-            'radius': 0.5,
-            'bsdf': {'type': 'diffuse', 'reflectance': {'type': 'rgb', 'value': [0.8, 0.2, 0.2]}}
-        },
-        'ground': {
-            'type': 'rectangle',
-            'to_world': mi.ScalarTransform4f.scale(10),
-            'bsdf': {'type': 'diffuse', 'reflectance': {'type': 'rgb', 'value': [0.5, 0.5, 0.5]}}
-        },
-        'light': {
-            'type': 'point',
-            'position': [5, 5, 5],
-            'intensity': {'type': 'spectrum', 'value': 100.0}
-        }
-    })
-    
-    target_image = mi.render(target_scene, spp=32)
-    
-    # Optimization scene with wrong initial position
-    initial_pos = [0.0, 0.0, 0.5]
     print(f"2. Initial guess: {initial_pos}")
     
-    opt_scene = mi.load_dict({
+    # One scene serves both the target render and the optimization
+    scene = mi.load_dict({
         'type': 'scene',
-        'integrator': {'type': 'path'},
+        'integrator': {'type': 'prb', 'max_depth': 4},
         'sensor': {
             'type': 'perspective',
             'fov': 45,
-            'to_world': mi.ScalarTransform4f.look_at(
-                origin=[5, 5, 3],
-                target=[0, 0, 1],
-                up=[0, 1, 0]
-            ),
+            'to_world': camera_to_world('position'),
             'film': {'type': 'hdrfilm', 'width': 128, 'height': 128}
         },
         'sphere': {
@@ -278,29 +419,38 @@ def example_2_optimize_position():
             'intensity': {'type': 'spectrum', 'value': 100.0}
         }
     })
+    params = mi.traverse(scene)
+    
+    # Moving the sphere rebuilds the geometry, so the target is evaluated
+    # before the initial position is written back
+    set_params(params, {'sphere.center': target_pos})
+    target_image = render_target(scene, spp=32)
+    set_params(params, {'sphere.center': initial_pos})
+    initial_image = render_target(scene, spp=32)
+    
+    # Only the pixels covered by the sphere at either position carry signal
+    mask = silhouette_mask(target_image, initial_image)
     
-    params = mi.traverse(opt_scene)
     params.keep(['sphere.center'])
     
-    opt = mi.ad.Adam(lr=0.1)
+    opt = mi.ad.Adam(lr=0.1, params=params)
+    warm_up(scene, params, spp)
     
     print("\n3. Optimizing position...")
     print(f"\n{'Iter':<8} {'Loss':<12} {'Pos X':<10} {'Pos Y':<10} {'Pos Z':<10}")
     print("-" * 60)
     
-    for i in range(100):
-        current_image = mi.render(opt_scene, params, spp=4)
-        loss = dr.mean(dr.sqr(current_image - target_image))
-        
-        dr.backward(loss)
-        opt.step(params)
-        params.update()
-        
-        if i % 20 == 0:
-            pos = params['sphere.center']
-            print(f"{i:<8} {loss[0]:<12.6f} {pos[0]:<10.4f} {pos[1]:<10.4f} {pos[2]:<10.4f}")
-    
-    final_pos = params['sphere.center']
+    history = []
+    for i in range(n_iter):
+        loss = optimization_step(scene, params, opt, target_image, spp=spp, seed=i, mask=mask)
+        if i % log_every == 0:
+            history.append((i, loss, params['sphere.center']))
+    
+    for i, loss, pos in history:
+        loss, pos = to_host(loss), to_host(pos)
+        print(f"{i:<8} {loss[0]:<12.6f} {pos[0]:<10.4f} {pos[1]:<10.4f} {pos[2]:<10.4f}")
+    
+    final_pos = to_host(params['sphere.center'])
     print("\n" + "="*60)
     print(f"Target position: [{target_pos[0]:.4f}, {target_pos[1]:.4f}, {target_pos[2]:.4f}]")
     print(f"Recovered:       [{final_pos[0]:.4f}, {final_pos[1]:.4f}, {final_pos[2]:.4f}]")
@@ -317,67 +467,33 @@ def example_3_light_estimation():
           recover the light position and intensity.
     """
     import mitsuba as mi
-    import drjit as dr
     
     print("\n" + "="*70)
     print("Example 3: Light Source Recovery from Image")
     print("="*70)
     
-    mi.set_variant('llvm_ad_rgb')
+    select_variant()
+    n_iter, spp = SCHEDULES[mi.variant()]['light']
+    log_every = max(1, n_iter // 5)
     
-    # Ground truth light
+    # Ground truth light and the wrong initial guess
     target_light_pos = [3.0, -2.0, 4.0]
     target_intensity = 80.0
-    
-    print(f"\n1. Target light position: {target_light_pos}")
-    print(f"   Target intensity: {target_intensity}")
-    
-    # Create target scene
-    target_scene = mi.load_dict({
-        'type': 'scene',
-        'integrator': {'type': 'path'},
-        'sensor': {
-            'type': 'perspective',
-            'fov': 45,
-            'to_world': mi.ScalarTransform4f.look_at(
-                origin=[0, -5, 2],
-                target=[0, 0, 1],
-                up=[0, 0, 1]
-            ),
-            'film': {'type': 'hdrfilm', 'width': 128, 'height': 128}
-        },
-        'sphere': {
-            'type': 'sphere',
-            'center': [0, 0, 1],
-            'radius': 1.0,
-            'bsdf': {'type': 'diffuse', 'reflectance': {'type': 'rgb', 'value': [0.8, 0.8, 0.8]}}
-        },
-        'light': {
-            'type': 'point',
-            'position': target_light_pos,
-            'intensity': {'type': 'spectrum', 'value': target_intensity}
-        }
-    })
-    
-    target_image = mi.render(target_scene, spp=32)
-    
-    # Optimization scene
     initial_light_pos = [0.0, 0.0, 3.0]
     initial_intensity = 50.0
     
+    print(f"\n1. Target light position: {target_light_pos}")
+    print(f"   Target intensity: {target_intensity}")
     print(f"2. Initial guess - position: {initial_light_pos}, intensity: {initial_intensity}")
     
-    opt_scene = mi.load_dict({
+    # One scene serves both the target render and the optimization
+    scene = mi.load_dict({
         'type': 'scene',
-        'integrator': {'type': 'path'},
+        'integrator': {'type': 'prb', 'max_depth': 4},
         'sensor': {
             'type': 'perspective',
             'fov': 45,
-            'to_world': mi.ScalarTransform4f.look_at(
-                origin=[0, -5, 2],
-                target=[0, 0, 1],
-                up=[0, 0, 1]
-            ),
+            'to_world': camera_to_world('light'),
             'film': {'type': 'hdrfilm', 'width': 128, 'height': 128}
         },
         'sphere': {
@@ -392,31 +508,40 @@ def example_3_light_estimation():
             'intensity': {'type': 'spectrum', 'value': initial_intensity}
         }
     })
+    params = mi.traverse(scene)
+    
+    set_params(params, {'light.position': target_light_pos,
+                        'light.intensity.value': target_intensity})
+    # Only the light changes before the warm-up render, so the target can be
+    # evaluated together with it
+    target_image = render_target(scene, spp=32, evaluate=False)
+    set_params(params, {'light.position': initial_light_pos,
+                        'light.intensity.value': initial_intensity})
     
-    params = mi.traverse(opt_scene)
     params.keep(['light.position', 'light.intensity.value'])
     
-    opt = mi.ad.Adam(lr=0.05)
+    opt = mi.ad.Adam(lr=0.05, params=params)
+    warm_up(scene, params, spp, pending=(target_image,))
+    
+    # Weight the loss towards the shading transitions on the sphere
+    mask = shading_mask(target_image)
     
     print("\n3. Optimizing light parameters...")
     print(f"\n{'Iter':<8} {'Loss':<12} {'Light X':<10} {'Light Y':<10} {'Light Z':<10} {'Intensity':<10}")
     print("-" * 70)
     
-    for i in range(80):
-        current_image = mi.render(opt_scene, params, spp=4)
-        loss = dr.mean(dr.sqr(current_image - target_image))
-        
-        dr.backward(loss)
-        opt.step(params)
-        params.update()
-        
-        if i % 20 == 0:
-            pos = params['light.position']
-            intensity = params['light.intensity.value']
-            print(f"{i:<8} {loss[0]:<12.6f} {pos[0]:<10.4f} {pos[1]:<10.4f} {pos[2]:<10.4f} {intensity[0]:<10.2f}")
-    
-    final_pos = params['light.position']
-    final_intensity = params['light.intensity.value']
+    history = []
+    for i in range(n_iter):
+        loss = optimization_step(scene, params, opt, target_image, spp=spp, seed=i, mask=mask)
+        if i % log_every == 0:
+            history.append((i, loss, params['light.position'], params['light.intensity.value']))
+    
+    for i, loss, pos, intensity in history:
+        loss, pos, intensity = to_host(loss), to_host(pos), to_host(intensity)
+        print(f"{i:<8} {loss[0]:<12.6f} {pos[0]:<10.4f} {pos[1]:<10.4f} {pos[2]:<10.4f} {intensity[0]:<10.2f}")
+    
+    final_pos = to_host(params['light.position'])
+    final_intensity = to_host(params['light.intensity.value'])
     
     print("\n" + "="*70)
     print(f"Target:    position=[{target_light_pos[0]:.2f}, {target_light_pos[1]:.2f}, {target_light_pos[2]:.2f}], intensity={target_intensity:.2f}")
@@ -426,8 +551,41 @@ def example_3_light_estimation():
     print("\n✓ Light estimation complete!")
 
 
+def run_example(number, example):
+    """Run one example, reporting a failure instead of raising it"""
+    try:
+        example()
+    except Exception as e:
+        print(f"\n✗ Example {number} failed: {e}")
+
+
+def run_example_process(number, threads):
+    """Run one example in its own Python process, returning its exit code"""
+    env = {**os.environ, 'MI_NUM_THREADS': str(threads)}
+    command = [sys.executable, os.path.abspath(__file__), '--example', str(number)]
+    return subprocess.run(command, env=env).returncode
+
+
+def parse_args():
+    """Command line options"""
+    parser = argparse.ArgumentParser(description="Run the inverse rendering examples")
+    parser.add_argument('--parallel', action='store_true',
+                        help="run the three examples side by side, one process each")
+    parser.add_argument('--example', type=int, choices=(1, 2, 3), default=None,
+                        help="run only this example")
+    return parser.parse_args()
+
+
 def main():
     """Run all inverse rendering examples"""
+    args = parse_args()
+    examples = [example_1_optimize_albedo, example_2_optimize_position, example_3_light_estimation]
+
+    if args.example is not None:
+        run_example(args.example, examples[args.example - 1])
+        release_memory()
+        return
+
     print("="*70)
     print("Mitsuba 3 - Inverse Rendering Examples")
     print("Demonstrating 2D→3D Reconstruction Capabilities")
@@ -439,21 +597,19 @@ def main():
         print("Install with: pip install mitsuba[ad]")
         return
     
-    # Run examples
-    try:
-        example_1_optimize_albedo()
-    except Exception as e:
-        print(f"\n✗ Example 1 failed: {e}")
-    
-    try:
-        example_2_optimize_position()
-    except Exception as e:
-        print(f"\n✗ Example 2 failed: {e}")
-    
-    try:
-        example_3_light_estimation()
-    except Exception as e:
-        print(f"\n✗ Example 3 failed: {e}")
+    if args.parallel:
+        # Each example gets its own process, and so its own Dr.Jit state (AD
+        # graph, variant, kernel history); the CPU cores are split between
+        # them. Their progress output interleaves
+        print("\nRunning the examples in parallel...")
+        threads = max(1, (os.cpu_count() or 1) // len(examples))
+        with ThreadPoolExecutor(max_workers=len(examples)) as executor:
+            list(executor.map(lambda number: run_example_process(number, threads),
+                              range(1, len(examples) + 1)))
+    else:
+        for number, example in enumerate(examples, start=1):
+            run_example(number, example)
+            release_memory()
     
     print("\n" + "="*70)
     print("All examples complete!")
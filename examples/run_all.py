@@ -0,0 +1,66 @@
+"""
+Run All Demos
+=============
+
+Renders demos 01-04 side by side instead of one after another.
+
+Each demo runs in its own Python process (so each gets its own Dr.Jit
+backend), and MI_NUM_THREADS splits the CPU cores between them so the
+concurrent renders don't oversubscribe the machine.
+
+Usage:
+    python run_all.py
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DEMOS = [
+    '01_basic_scene.py',
+    '02_materials_showcase.py',
+    '03_lighting_techniques.py',
+    '04_advanced_scene.py',
+]
+
+# Render threads given to each demo process
+THREADS_PER_RENDER = 4
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_demo(script, threads):
+    """Run one demo script to completion, returning (script, exit code, seconds)"""
+    env = {**os.environ, 'MI_NUM_THREADS': str(threads)}
+    start = time.time()
+    result = subprocess.run([sys.executable, script], cwd=EXAMPLES_DIR, env=env)
+    return script, result.returncode, time.time() - start
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    workers = max(1, min(len(DEMOS), cpus // THREADS_PER_RENDER))
+    threads = max(1, cpus // workers)
+
+    print("Running All Demos")
+    print("=" * 50)
+    print(f"🚀 {len(DEMOS)} demos, {workers} at a time, {threads} threads each")
+
+    start = time.time()
+    # The demos are separate processes already; threads only wait on them
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(lambda script: run_demo(script, threads), DEMOS))
+
+    print("\n" + "=" * 50)
+    for script, code, seconds in results:
+        status = "✅" if code == 0 else f"✗ (exit {code})"
+        print(f"   {status} {script} ({seconds:.1f}s)")
+    print(f"\n⏱️  Total: {time.time() - start:.1f}s")
+
+    return 0 if all(code == 0 for _, code, _ in results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
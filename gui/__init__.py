@@ -6,6 +6,12 @@ A professional PyQt6-based interface for Mitsuba 3 rendering demos
 __version__ = "1.0.0"
 __author__ = "Mitsuba3-Learning-Demos"
 
-from gui.core.main_window import MainWindow
-
 __all__ = ["MainWindow"]
+
+
+def __getattr__(name):
+    # MainWindow pulls in PyQt6 and Mitsuba; import it only when asked for
+    if name == "MainWindow":
+        from gui.core.main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,5 +1,12 @@
 """Core GUI components"""
-from gui.core.main_window import MainWindow
 from gui.core.config import AppConfig
 
 __all__ = ["MainWindow", "AppConfig"]
+
+
+def __getattr__(name):
+    # Keep `from gui.core import AppConfig` free of the PyQt6/Mitsuba imports
+    if name == "MainWindow":
+        from gui.core.main_window import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,10 +2,20 @@
 Application configuration settings
 """
 
-from dataclasses import dataclass, field
+from dataclasses import MISSING, dataclass, field, fields
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+# Repository root, resolved once at import
+_ROOT = Path(__file__).resolve().parent.parent.parent
+
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: Path) -> None:
+    """Create a directory, touching the filesystem only once per path"""
+    path.mkdir(exist_ok=True)
+
 
 @dataclass
 class AppConfig:
@@ -16,9 +26,9 @@ class AppConfig:
     app_version: str = "1.0.0"
     
     # Paths
-    project_root: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent)
-    output_dir: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "output")
-    log_dir: Path = field(default_factory=lambda: Path(__file__).parent.parent.parent / "logs")
+    project_root: Path = field(default_factory=lambda: _ROOT)
+    output_dir: Path = field(default_factory=lambda: _ROOT / "output")
+    log_dir: Path = field(default_factory=lambda: _ROOT / "logs")
     
     # Window settings
     window_width: int = 1400
@@ -45,24 +55,25 @@ class AppConfig:
     
     def __post_init__(self):
         """Ensure directories exist"""
-        self.output_dir.mkdir(exist_ok=True)
-        self.log_dir.mkdir(exist_ok=True)
+        _ensure_dir(self.output_dir)
+        _ensure_dir(self.log_dir)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary"""
-        return {
-            "app_name": self.app_name,
-            "app_version": self.app_version,
-            "window_width": self.window_width,
-            "window_height": self.window_height,
-            "theme": self.theme,
-            "dark_mode": self.dark_mode,
-            "default_resolution": self.default_resolution,
-            "default_spp": self.default_spp,
-            "default_variant": self.default_variant,
-        }
+        return {name: getattr(self, name) for name in _EXPORTED_FIELDS}
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AppConfig":
         """Create config from dictionary"""
-        return cls(**{k: v for k, v in data.items() if hasattr(cls, k)})
+        return cls(**{k: v for k, v in data.items() if k in _FIELD_NAMES})
+
+
+# Settings written by to_dict() (paths and GUI layout stay per-install)
+_EXPORTED_FIELDS = (
+    "app_name", "app_version", "window_width", "window_height", "theme", "dark_mode",
+    "default_resolution", "default_spp", "default_variant",
+)
+
+# Fields from_dict() accepts: those with a plain class-level default. The path
+# fields built by default factories are left out, as they must stay Paths
+_FIELD_NAMES = frozenset(f.name for f in fields(AppConfig) if f.default_factory is MISSING)
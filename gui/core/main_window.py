@@ -2,13 +2,19 @@
 Main application window with draggable tabs and resizable sidebar
 """
 
+import hashlib
+import json
+import os
 import sys
+import time
+from collections import deque
+from functools import lru_cache
 from pathlib import Path
 from PyQt6.QtWidgets import (
     QMainWindow, QTabWidget, QSplitter, QWidget, QVBoxLayout,
     QApplication, QMessageBox, QTabBar
 )
-from PyQt6.QtCore import Qt, QSize, QProcess
+from PyQt6.QtCore import Qt, QSize, QProcess, QTimer, pyqtSignal
 from PyQt6.QtGui import QIcon, QPalette, QColor
 
 from gui.core.config import AppConfig
@@ -20,10 +26,63 @@ from gui.utils.logger import setup_logger, add_gui_handler, get_logger
 
 from loguru import logger
 
+# Stylesheet applied on top of the dark palette
+DARK_QSS_PATH = Path(__file__).parent.parent / "resources" / "dark.qss"
+
+# (second, "HH:MM:SS") of the last timestamp formatted for the log viewer
+_last_timestamp = (None, "")
+
+
+def _render_key(scene_dict: dict, params: dict, output_name: str) -> str:
+    """Digest of everything that determines a render's output image"""
+    text = json.dumps([scene_dict, params, output_name], sort_keys=True, default=repr)
+    return hashlib.sha1(text.encode()).hexdigest()
+
+
+def _timestamp() -> str:
+    """Current time as HH:MM:SS, formatted at most once per second"""
+    global _last_timestamp
+    now = int(time.time())
+    if now != _last_timestamp[0]:
+        _last_timestamp = (now, time.strftime('%H:%M:%S', time.localtime(now)))
+    return _last_timestamp[1]
+
+
+@lru_cache(maxsize=None)
+def _dark_stylesheet() -> str:
+    """Contents of dark.qss, read from disk once per process"""
+    return DARK_QSS_PATH.read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=None)
+def _dark_palette() -> QPalette:
+    """Dark Fusion palette, built on first use (after the QApplication exists)"""
+    dark_palette = QPalette()
+    dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
+    dark_palette.setColor(QPalette.ColorRole.WindowText, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.Base, QColor(35, 35, 35))
+    dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
+    dark_palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(25, 25, 25))
+    dark_palette.setColor(QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53))
+    dark_palette.setColor(QPalette.ColorRole.ButtonText, Qt.GlobalColor.white)
+    dark_palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
+    dark_palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
+    dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
+    dark_palette.setColor(QPalette.ColorRole.HighlightedText, Qt.GlobalColor.black)
+    return dark_palette
+
 
 class MainWindow(QMainWindow):
     """Main application window"""
     
+    # Longest time a log line waits before it is shown
+    LOG_FLUSH_INTERVAL_MS = 50
+    
+    # Loguru records, which may be emitted from worker threads
+    log_received = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
         
@@ -39,14 +98,36 @@ class MainWindow(QMainWindow):
         # Initialize renderer
         self.renderer = SubprocessRenderer(self.config.output_dir)
         
+        # Log lines are buffered and written to the log viewer in batches,
+        # at most every LOG_FLUSH_INTERVAL_MS, instead of one update per line.
+        # The viewer only keeps log_max_lines, so older lines are dropped here
+        self._log_buffer = deque(maxlen=self.config.log_max_lines)
+        self._log_flush_timer = QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(self.LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+        
+        # Factories of scene tabs not built yet, keyed by their placeholder
+        self._tab_factories = {}
+        
+        # Tab that requested the running render, and its progress callback
+        self._render_tab = None
+        self._render_progress_fn = None
+        self._render_key = None
+        
+        # (render key, output path) of each tab's last finished render
+        self._render_cache = {}
+        
         # Setup UI
         self._setup_window()
         self._apply_theme()
         self._setup_ui()
         self._connect_signals()
         
-        # Register GUI log handler
-        add_gui_handler(self._on_log_message)
+        # Register GUI log handler. Records reach the GUI thread through a
+        # queued signal, so logging from a render thread is safe
+        self.log_received.connect(self._on_log_message, Qt.ConnectionType.QueuedConnection)
+        add_gui_handler(self.log_received.emit)
         
         logger.info("Application initialized successfully")
     
@@ -56,87 +137,23 @@ class MainWindow(QMainWindow):
         self.resize(self.config.window_width, self.config.window_height)
         
         # Center on screen
-        from PyQt6.QtGui import QScreen
         screen = QApplication.primaryScreen().geometry()
-        x = (screen.width() - self.width()) // 2
-        y = (screen.height() - self.height()) // 2
-        self.move(x, y)
+        self.move(screen.center() - self.rect().center())
     
     def _apply_theme(self):
         """Apply dark Fusion theme"""
         app = QApplication.instance()
-        app.setStyle("Fusion")
+        # setStyle() re-polishes every widget; skip it when Fusion is already active
+        if app.style().objectName().lower() != "fusion":
+            app.setStyle("Fusion")
         
         # Dark palette
-        dark_palette = QPalette()
-        dark_palette.setColor(QPalette.ColorRole.Window, QColor(53, 53, 53))
-        dark_palette.setColor(QPalette.ColorRole.WindowText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Base, QColor(35, 35, 35))
-        dark_palette.setColor(QPalette.ColorRole.AlternateBase, QColor(53, 53, 53))
-        dark_palette.setColor(QPalette.ColorRole.ToolTipBase, QColor(25, 25, 25))
-        dark_palette.setColor(QPalette.ColorRole.ToolTipText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Text, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.Button, QColor(53, 53, 53))
-        dark_palette.setColor(QPalette.ColorRole.ButtonText, Qt.GlobalColor.white)
-        dark_palette.setColor(QPalette.ColorRole.BrightText, Qt.GlobalColor.red)
-        dark_palette.setColor(QPalette.ColorRole.Link, QColor(42, 130, 218))
-        dark_palette.setColor(QPalette.ColorRole.Highlight, QColor(42, 130, 218))
-        dark_palette.setColor(QPalette.ColorRole.HighlightedText, Qt.GlobalColor.black)
-        
-        app.setPalette(dark_palette)
+        dark_palette = _dark_palette()
+        if app.palette() != dark_palette:
+            app.setPalette(dark_palette)
         
         # Additional stylesheet
-        app.setStyleSheet("""
-            QToolTip {
-                color: #ffffff;
-                background-color: #2a2a2a;
-                border: 1px solid #555555;
-            }
-            QTabWidget::pane {
-                border: 1px solid #3e3e3e;
-                background: #2d2d2d;
-            }
-            QTabBar::tab {
-                background: #3e3e3e;
-                color: #d4d4d4;
-                padding: 8px 16px;
-                margin-right: 2px;
-                border: 1px solid #555555;
-            }
-            QTabBar::tab:selected {
-                background: #4ec9b0;
-                color: #000000;
-                font-weight: bold;
-            }
-            QTabBar::tab:hover {
-                background: #505050;
-            }
-            QPushButton {
-                padding: 6px 12px;
-                background: #3e3e3e;
-                border: 1px solid #555555;
-                border-radius: 3px;
-            }
-            QPushButton:hover {
-                background: #505050;
-            }
-            QPushButton:pressed {
-                background: #2a2a2a;
-            }
-            QPushButton:disabled {
-                background: #2a2a2a;
-                color: #666666;
-            }
-            QProgressBar {
-                border: 1px solid #3e3e3e;
-                border-radius: 3px;
-                text-align: center;
-                background: #2d2d2d;
-            }
-            QProgressBar::chunk {
-                background-color: #4ec9b0;
-            }
-        """)
+        app.setStyleSheet(_dark_stylesheet())
         
         logger.debug("Dark Fusion theme applied")
     
@@ -158,9 +175,11 @@ class MainWindow(QMainWindow):
         self.tab_widget.setMovable(self.config.tabs_movable)
         self.tab_widget.setDocumentMode(True)
         
-        # Add home tab
-        self.home_tab = HomeTab(self.config)
-        self.tab_widget.addTab(self.home_tab, "🏠 Home")
+        # Home tab: a placeholder until the first event loop tick, so the
+        # window can be painted before the settings widgets are built
+        self.home_tab = None
+        self.add_scene_tab(self._create_home_tab, "Home", "🏠")
+        QTimer.singleShot(0, self._finish_setup)
         
         # Right side: Sidebar with log and output viewers
         sidebar = QWidget()
@@ -195,18 +214,18 @@ class MainWindow(QMainWindow):
     
     def _connect_signals(self):
         """Connect signals and slots"""
-        # Home tab settings
-        self.home_tab.settings_changed.connect(self._on_settings_changed)
-        self.home_tab.log_message.connect(self._on_tab_log)
+        # The tab widget emits on the GUI thread: call slots directly
+        direct = Qt.ConnectionType.DirectConnection
+        queued = Qt.ConnectionType.QueuedConnection
         
-        # Renderer signals
-        self.renderer.progress_updated.connect(self._on_render_progress)
-        self.renderer.render_complete.connect(self._on_render_complete)
-        self.renderer.render_failed.connect(self._on_render_failed)
-        self.renderer.log_message.connect(self._on_renderer_log)
+        # Renderer signals are driven by the render process: always queue them
+        self.renderer.progress_updated.connect(self._on_render_progress, queued)
+        self.renderer.render_complete.connect(self._on_render_complete, queued)
+        self.renderer.render_failed.connect(self._on_render_failed, queued)
+        self.renderer.log_message.connect(self._on_log_message, queued)
         
         # Tab changes
-        self.tab_widget.currentChanged.connect(self._on_tab_changed)
+        self.tab_widget.currentChanged.connect(self._on_tab_changed, direct)
         
         logger.debug("Signals connected")
     
@@ -215,50 +234,90 @@ class MainWindow(QMainWindow):
         Add a new scene tab to the interface
         
         Args:
-            tab_widget: The tab widget to add
+            tab_widget: The tab widget to add, or a zero-argument callable
+                (e.g. the tab class) that builds it. A callable is only
+                invoked the first time the user opens the tab
             tab_name: Display name for the tab
             icon: Optional icon/emoji for the tab
         """
-        # Connect tab signals
-        if hasattr(tab_widget, 'render_requested'):
-            tab_widget.render_requested.connect(self._on_render_requested)
-        if hasattr(tab_widget, 'log_message'):
-            tab_widget.log_message.connect(self._on_tab_log)
-        
-        # Add to tab widget
         full_name = f"{icon} {tab_name}" if icon else tab_name
-        self.tab_widget.addTab(tab_widget, full_name)
+        
+        if isinstance(tab_widget, QWidget):
+            self._connect_tab(tab_widget)
+            self.tab_widget.addTab(tab_widget, full_name)
+        else:
+            # Empty placeholder until the tab is first selected
+            placeholder = QWidget()
+            self._tab_factories[placeholder] = tab_widget
+            self.tab_widget.addTab(placeholder, full_name)
         
         logger.info(f"Tab added: {tab_name}")
     
+    def _connect_tab(self, tab_widget):
+        """Connect a scene tab's signals (declared on BaseTab) to the window"""
+        # Tabs live on the GUI thread, so their slots are called directly
+        direct = Qt.ConnectionType.DirectConnection
+        tab_widget.render_requested.connect(self._on_render_requested, direct)
+        tab_widget.log_message.connect(self._on_log_message, direct)
+    
+    def _create_home_tab(self):
+        """Build the home tab (its tab factory)"""
+        self.home_tab = HomeTab(self.config)
+        self.home_tab.settings_changed.connect(
+            self._on_settings_changed, Qt.ConnectionType.DirectConnection)
+        return self.home_tab
+    
+    def _finish_setup(self):
+        """Build the home tab once the window is up, unless it's already built"""
+        if self.home_tab is None:
+            self._build_lazy_tab(0)
+    
+    def _build_lazy_tab(self, index: int):
+        """Replace the placeholder at index with the real tab, built now"""
+        placeholder = self.tab_widget.widget(index)
+        factory = self._tab_factories.pop(placeholder)
+        tab = factory()
+        self._connect_tab(tab)
+        
+        # Swap without re-entering _on_tab_changed
+        self.tab_widget.blockSignals(True)
+        current = self.tab_widget.currentIndex()
+        text = self.tab_widget.tabText(index)
+        self.tab_widget.removeTab(index)
+        self.tab_widget.insertTab(index, tab, text)
+        self.tab_widget.setCurrentIndex(current)
+        self.tab_widget.blockSignals(False)
+        placeholder.deleteLater()
+        
+        logger.debug(f"Tab built on first use: {text}")
+    
     def _on_settings_changed(self, settings: dict):
         """Handle global settings changes"""
         logger.info(f"Settings updated: {settings}")
+        self._render_cache.clear()
+        self._flush_log()
         self.log_viewer.log_success("Settings updated successfully")
     
-    def _on_tab_log(self, message: str):
-        """Handle log messages from tabs"""
-        # Add timestamp if not present
-        if not message.startswith('['):
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%H:%M:%S')
-            message = f"[{timestamp}] [INFO] {message}"
-        self.log_viewer.append_log(message)
-    
-    def _on_renderer_log(self, message: str):
-        """Handle log messages from renderer"""
-        # Messages from subprocess already have timestamp
-        # Just ensure they're displayed
-        if not message.startswith('['):
-            from datetime import datetime
-            timestamp = datetime.now().strftime('%H:%M:%S')
-            message = f"[{timestamp}] [INFO] {message}"
-        self.log_viewer.append_log(message)
-    
     def _on_log_message(self, message: str):
-        """Handle log messages from loguru"""
-        # This receives formatted HTML from loguru
-        self.log_viewer.append_log(str(message))
+        """
+        Handle log messages from tabs, the renderer and loguru
+        
+        Loguru and subprocess lines arrive already stamped ("[HH:MM:SS] ..."),
+        plain tab messages get a timestamp and INFO level added.
+        """
+        message = str(message)
+        if message[:1] != '[':
+            message = f"[{_timestamp()}] [INFO] {message}"
+        self._log_buffer.append(message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
+    
+    def _flush_log(self):
+        """Write all buffered log lines to the log viewer in one update"""
+        self._log_flush_timer.stop()
+        if self._log_buffer:
+            self.log_viewer.append_logs(self._log_buffer)
+            self._log_buffer.clear()
     
     def _on_render_requested(self, scene_dict: dict, params: dict, output_name: str):
         """Handle render request from a tab"""
@@ -274,52 +333,97 @@ class MainWindow(QMainWindow):
         
         logger.info(f"Render request: {output_name} with params: {merged_params}")
         
+        # Same scene and settings as the tab's last render: show that image again
+        tab = self.sender() or self.tab_widget.currentWidget()
+        key = _render_key(scene_dict, merged_params, output_name)
+        cached_key, cached_path = self._render_cache.get(tab, (None, None))
+        if key == cached_key and os.path.exists(cached_path):
+            # Posted, so the tab finishes starting the render (and logs it)
+            # before the result is shown
+            QTimer.singleShot(0, lambda: self._show_cached_render(tab, cached_path))
+            return
+        
+        # Remember the requesting tab's callbacks once per render, so progress
+        # ticks don't look up the current tab (the user may also switch tabs)
+        if self._render_tab is None:
+            self._render_tab = tab
+            self._render_progress_fn = getattr(tab, 'update_progress', None)
+            self._render_key = key
+        
         # Start rendering
         self.renderer.render_scene(scene_dict, merged_params, output_name)
     
+    def _show_cached_render(self, tab, output_path: str):
+        """Complete a render request from the tab's previous, identical render"""
+        on_render_complete = getattr(tab, 'on_render_complete', None)
+        if on_render_complete is not None:
+            on_render_complete()
+        
+        self.output_viewer.display_image(image_path=output_path)
+        
+        self._flush_log()
+        self.log_viewer.log_success(f"Scene unchanged, showing last render: {os.path.basename(output_path)}")
+        logger.info(f"Reused render: {output_path}")
+    
+    def _finish_render(self):
+        """Forget the tab of the render that just ended and return it"""
+        tab = self._render_tab
+        self._render_tab = None
+        self._render_progress_fn = None
+        return tab
+    
     def _on_render_progress(self, progress: int):
         """Handle render progress updates"""
-        # Update current tab's progress bar
-        current_tab = self.tab_widget.currentWidget()
-        if hasattr(current_tab, 'update_progress'):
-            current_tab.update_progress(progress)
+        # Update the requesting tab's progress bar
+        update_progress = self._render_progress_fn
+        if update_progress is not None:
+            update_progress(progress)
     
     def _on_render_complete(self, image_array, output_path: str):
         """Handle render completion"""
-        # Update current tab
-        current_tab = self.tab_widget.currentWidget()
-        if hasattr(current_tab, 'on_render_complete'):
-            current_tab.on_render_complete()
+        # Update the requesting tab and remember what it rendered
+        tab = self._finish_render()
+        if tab is not None:
+            self._render_cache[tab] = (self._render_key, output_path)
+        on_render_complete = getattr(tab, 'on_render_complete', None)
+        if on_render_complete is not None:
+            on_render_complete()
         
         # Display in output viewer
         self.output_viewer.display_image(image_path=output_path)
         
         # Log success
-        self.log_viewer.log_success(f"Render complete: {Path(output_path).name}")
+        self._flush_log()
+        self.log_viewer.log_success(f"Render complete: {os.path.basename(output_path)}")
         logger.success(f"Render displayed: {output_path}")
     
     def _on_render_failed(self, error: str):
         """Handle render failure"""
-        # Update current tab
-        current_tab = self.tab_widget.currentWidget()
-        if hasattr(current_tab, 'on_render_failed'):
-            current_tab.on_render_failed(error)
+        # Update the requesting tab
+        on_render_failed = getattr(self._finish_render(), 'on_render_failed', None)
+        if on_render_failed is not None:
+            on_render_failed(error)
         
         # Log error
+        self._flush_log()
         self.log_viewer.log_error(error)
     
     def _on_tab_changed(self, index: int):
         """Handle tab changes"""
         tab = self.tab_widget.widget(index)
-        tab_name = self.tab_widget.tabText(index)
-        logger.debug(f"Tab switched to: {tab_name}")
+        if tab in self._tab_factories:
+            self._build_lazy_tab(index)
+        # Only look up the tab text if a sink actually takes debug records
+        logger.opt(lazy=True).debug(
+            "Tab switched to: {}", lambda: self.tab_widget.tabText(index))
     
     def closeEvent(self, event):
         """Handle window close"""
         # Cancel any ongoing render
         try:
-            # Check if subprocess renderer has an active process
-            if hasattr(self.renderer, 'process') and self.renderer.process is not None:
+            # Check if subprocess renderer has an active process. Both
+            # renderers define process and current_worker (None when unused)
+            if self.renderer.process is not None:
                 if self.renderer.process.state() == QProcess.ProcessState.Running:
                     reply = QMessageBox.question(
                         self,
@@ -338,11 +442,10 @@ class MainWindow(QMainWindow):
                         return
                 
                 # Clean up renderer resources
-                if hasattr(self.renderer, 'cleanup'):
-                    self.renderer.cleanup()
+                self.renderer.cleanup()
                     
             # Handle old threaded renderer (if used)
-            elif hasattr(self.renderer, 'current_worker') and self.renderer.current_worker is not None:
+            elif self.renderer.current_worker is not None:
                 if self.renderer.current_worker.isRunning():
                     reply = QMessageBox.question(
                         self,
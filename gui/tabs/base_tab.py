@@ -2,39 +2,45 @@
 Base tab interface for all scene tabs
 """
 
-from abc import ABCMeta, abstractmethod
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QHBoxLayout, QProgressBar
 from PyQt6.QtCore import pyqtSignal
 from typing import Dict, Any
 from loguru import logger
 
 
-# Create a metaclass that combines QWidget's metaclass and ABCMeta
-class QABCMeta(type(QWidget), ABCMeta):
-    """Metaclass that combines Qt and ABC metaclasses"""
-    pass
-
-
-class BaseTab(QWidget, metaclass=QABCMeta):
+class BaseTab(QWidget):
     """
     Abstract base class for all scene tabs
     Provides common functionality and interface
     """
     
+    # Methods every subclass must override (checked when the subclass is defined)
+    ABSTRACT_METHODS = ('setup_ui', 'get_scene_dict', 'get_default_params')
+    
     render_requested = pyqtSignal(dict, dict, str)  # scene_dict, params, output_name
     log_message = pyqtSignal(str)
     
+    def __init_subclass__(cls, **kwargs):
+        """Reject subclasses that leave one of ABSTRACT_METHODS unimplemented"""
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in BaseTab.ABSTRACT_METHODS
+                   if getattr(cls, name) is getattr(BaseTab, name)]
+        if missing:
+            raise TypeError(f"{cls.__name__} must implement: {', '.join(missing)}")
+    
     def __init__(self, tab_name: str, parent=None):
         super().__init__(parent)
         self.tab_name = tab_name
         self._is_rendering = False
+        self._last_progress = -1
+        self._ui_built = False
         self._setup_base_ui()
     
     def _setup_base_ui(self):
         """Setup base UI components common to all tabs"""
         self.main_layout = QVBoxLayout(self)
         
-        # Subclass will add content here via setup_ui()
+        # Subclass adds content here via setup_ui(), when first shown
         self.content_layout = QVBoxLayout()
         self.main_layout.addLayout(self.content_layout)
         
@@ -42,6 +48,7 @@ class BaseTab(QWidget, metaclass=QABCMeta):
         self.progress_bar = QProgressBar()
         self.progress_bar.setVisible(False)
         self.progress_bar.setTextVisible(True)
+        self.progress_bar.setFormat("%p%")
         self.main_layout.addWidget(self.progress_bar)
         
         # Control buttons
@@ -61,16 +68,22 @@ class BaseTab(QWidget, metaclass=QABCMeta):
         button_layout.addStretch()
         
         self.main_layout.addLayout(button_layout)
-        
-        # Call subclass setup
-        self.setup_ui()
     
-    @abstractmethod
+    def ensure_ui(self):
+        """Build the subclass UI (setup_ui()) if it hasn't been built yet"""
+        if not self._ui_built:
+            self._ui_built = True
+            self.setup_ui()
+    
+    def showEvent(self, event):
+        """Build the subclass UI the first time the tab is shown"""
+        self.ensure_ui()
+        super().showEvent(event)
+    
     def setup_ui(self):
         """Subclass must implement this to setup custom UI"""
         pass
     
-    @abstractmethod
     def get_scene_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
         Subclass must implement this to return Mitsuba scene dictionary
@@ -83,7 +96,6 @@ class BaseTab(QWidget, metaclass=QABCMeta):
         """
         pass
     
-    @abstractmethod
     def get_default_params(self) -> Dict[str, Any]:
         """
         Subclass must implement this to return default rendering parameters
@@ -138,12 +150,15 @@ class BaseTab(QWidget, metaclass=QABCMeta):
         if is_rendering:
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(0)
+            self._last_progress = 0
         else:
             self.progress_bar.setVisible(False)
     
     def update_progress(self, value: int):
-        """Update progress bar"""
-        self.progress_bar.setValue(value)
+        """Update progress bar (repeated values don't repaint it)"""
+        if value != self._last_progress:
+            self._last_progress = value
+            self.progress_bar.setValue(value)
     
     def on_render_complete(self):
         """Called when rendering completes"""
@@ -92,6 +92,9 @@ class BasicSceneTab(BaseTab):
         material_params = self.material_params.get_parameters()
         camera_params = self.camera_params.get_parameters()
         
+        # Slider values are percentages; scale by 1/100 once per value
+        pct = 0.01
+        
         # Build scene parameters
         scene_params = {
             'width': params.get('width', 800),
@@ -103,14 +106,14 @@ class BasicSceneTab(BaseTab):
             'camera_distance': camera_params['distance'],
             'material_type': material_params['material'],
             'material_color': (
-                material_params['color_r'] / 100.0,
-                material_params['color_g'] / 100.0,
-                material_params['color_b'] / 100.0
+                material_params['color_r'] * pct,
+                material_params['color_g'] * pct,
+                material_params['color_b'] * pct
             ),
-            'roughness': material_params['roughness'] / 100.0,
+            'roughness': material_params['roughness'] * pct,
         }
         
-        logger.debug(f"Scene params: {scene_params}")
+        logger.debug("Scene params: {}", scene_params)
         return self.scene_gen.generate(scene_params)
     
     def get_default_params(self) -> Dict[str, Any]:
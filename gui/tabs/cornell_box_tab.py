@@ -101,19 +101,22 @@ class CornellBoxTab(BaseTab):
         wall_params = self.wall_params.get_parameters()
         object_params = self.object_params.get_parameters()
         
+        # Slider values are percentages; scale by 1/100 once per value
+        pct = 0.01
+        
         scene_params = {
             'width': params.get('width', 800),
             'height': params.get('height', 800),
             'box_size': box_params['box_size'],
             'left_wall_color': (
-                wall_params['left_r'] / 100.0,
-                wall_params['left_g'] / 100.0,
-                wall_params['left_b'] / 100.0
+                wall_params['left_r'] * pct,
+                wall_params['left_g'] * pct,
+                wall_params['left_b'] * pct
             ),
             'right_wall_color': (
-                wall_params['right_r'] / 100.0,
-                wall_params['right_g'] / 100.0,
-                wall_params['right_b'] / 100.0
+                wall_params['right_r'] * pct,
+                wall_params['right_g'] * pct,
+                wall_params['right_b'] * pct
             ),
             'back_wall_color': (0.725, 0.71, 0.68),
             'floor_color': (0.725, 0.71, 0.68),
@@ -124,7 +127,7 @@ class CornellBoxTab(BaseTab):
             'box_size_param': object_params['box_size'],
         }
         
-        logger.debug(f"Cornell Box params: {scene_params}")
+        logger.debug("Cornell Box params: {}", scene_params)
         return self.scene_gen.generate(scene_params)
     
     def get_default_params(self) -> Dict[str, Any]:
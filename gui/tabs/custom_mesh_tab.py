@@ -4,31 +4,114 @@ Custom Mesh Tab - Load and render custom 3D models
 ⚠️ TODO: This tab is partially functional but has known issues.
 See TODO.md for details on:
 - STL file loading problems (some files fail with normals error)
-- Need automatic camera positioning based on mesh bounds
 - Need better error handling and validation
-- Need mesh statistics display
 
 Current status: Works for some OBJ/PLY files, STL support experimental
 """
 
 from PyQt6.QtWidgets import (
     QScrollArea, QWidget, QVBoxLayout, QLabel, QPushButton, 
-    QFileDialog, QLineEdit, QHBoxLayout
+    QFileDialog, QLineEdit, QHBoxLayout, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, pyqtSignal
 from gui.tabs.base_tab import BaseTab
 from gui.widgets.parameter_widget import ParameterWidget
+from functools import lru_cache
+import math
 from typing import Dict, Any
 from loguru import logger
 from pathlib import Path
 
 
+# ParameterWidget.add_many() specs: (kind, name, label, add_*_parameter kwargs)
+TRANSFORM_SPECS = (
+    ('float', 'mesh_scale', 'Scale:', dict(
+        default=1.0, min_val=0.1, max_val=10.0, step=0.1, tooltip="Scale the mesh")),
+    ('slider', 'mesh_rotation_x', 'Rotation X:', dict(
+        default=0, min_val=0, max_val=360, tooltip="Rotation around X axis (degrees)")),
+    ('slider', 'mesh_rotation_y', 'Rotation Y:', dict(
+        default=0, min_val=0, max_val=360, tooltip="Rotation around Y axis (degrees)")),
+    ('slider', 'mesh_rotation_z', 'Rotation Z:', dict(
+        default=0, min_val=0, max_val=360, tooltip="Rotation around Z axis (degrees)")),
+    ('float', 'mesh_pos_x', 'Position X:', dict(
+        default=0.0, min_val=-10.0, max_val=10.0, step=0.1, tooltip="X position")),
+    ('float', 'mesh_pos_y', 'Position Y:', dict(
+        default=0.0, min_val=-10.0, max_val=10.0, step=0.1, tooltip="Y position")),
+    ('float', 'mesh_pos_z', 'Position Z:', dict(
+        default=0.0, min_val=-10.0, max_val=10.0, step=0.1, tooltip="Z position")),
+)
+
+CAMERA_SPECS = (
+    ('float', 'camera_distance', 'Distance:', dict(
+        default=5.0, min_val=1.0, max_val=20.0, step=0.5, tooltip="Camera distance from the mesh centre")),
+    ('float', 'camera_height', 'Height:', dict(
+        default=2.0, min_val=-5.0, max_val=10.0, step=0.5, tooltip="Camera height above the mesh centre")),
+)
+
+
+def _mesh_to_world(point, scale, rotation, position):
+    """Map a point through the generator's mesh transform (scale, rotate Z, Y, X, translate)"""
+    x, y, z = (scale * c for c in point)
+    rx, ry, rz = (math.radians(angle) for angle in rotation)
+    x, y = x * math.cos(rz) - y * math.sin(rz), x * math.sin(rz) + y * math.cos(rz)
+    z, x = z * math.cos(ry) - x * math.sin(ry), z * math.sin(ry) + x * math.cos(ry)
+    y, z = y * math.cos(rx) - z * math.sin(rx), y * math.sin(rx) + z * math.cos(rx)
+    return (position[0] + x, position[1] + y, position[2] + z)
+
+
+@lru_cache(maxsize=None)
+def _mesh_generator():
+    """CustomMeshGenerator, imported on first use"""
+    from gui_examples.custom_mesh import CustomMeshGenerator
+    return CustomMeshGenerator
+
+
+class MeshParseSignals(QObject):
+    """Signals of MeshParseTask (a QRunnable can't emit signals itself)"""
+    
+    progress = pyqtSignal(int)  # percent of the file parsed
+    mesh_ready = pyqtSignal(str, object)  # path, (vertices, faces)
+    mesh_failed = pyqtSignal(str, str)  # path, error
+
+
+class MeshParseTask(QRunnable):
+    """Parse a mesh file on a QThreadPool thread"""
+    
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.signals = MeshParseSignals()
+    
+    def run(self):
+        try:
+            mesh = _mesh_generator().parse_only(self.path, progress=self.signals.progress.emit)
+        except Exception as e:
+            self.signals.mesh_failed.emit(self.path, str(e))
+        else:
+            self.signals.mesh_ready.emit(self.path, mesh)
+
+
 class CustomMeshTab(BaseTab):
     """Tab for loading and rendering custom 3D meshes"""
     
     def __init__(self, parent=None):
         super().__init__("Custom Mesh", parent)
         self.mesh_file_path = None
+        # (vertices, faces) of mesh_file_path, once parsed in the background,
+        # and the centre of its bounding box
+        self._parsed_mesh = None
+        self._mesh_center = None
+        # Generator parameters, updated in place by get_scene_dict() whenever
+        # their key (output size, mesh file and control versions) changes
+        self._gen_params = {
+            'width': 0, 'height': 0, 'mesh_file': None,
+            'mesh_scale': 1.0, 'mesh_rotation_x': 0.0, 'mesh_rotation_y': 0.0,
+            'mesh_rotation_z': 0.0, 'mesh_position': (0.0, 0.0, 0.0),
+            'camera_distance': 0.0, 'camera_height': 0.0, 'camera_target': None,
+            'material_type': '', 'material_color': (0.0, 0.0, 0.0), 'roughness': 0.0,
+            'use_ground': True, 'light_type': '',
+        }
+        self._gen_params_key = None
     
     def setup_ui(self):
         """Setup the tab UI"""
@@ -47,7 +130,7 @@ class CustomMeshTab(BaseTab):
             "Free models: polyhaven.com, free3d.com, sketchfab.com"
         )
         info.setWordWrap(True)
-        info.setStyleSheet("color: #4ec9b0; padding: 10px; background: #2d2d2d; border-radius: 5px;")
+        info.setObjectName("infoLabel")
         scroll_layout.addWidget(info)
         
         # File selection
@@ -55,7 +138,7 @@ class CustomMeshTab(BaseTab):
         file_layout = QVBoxLayout(file_widget)
         
         file_label = QLabel("Mesh File:")
-        file_label.setStyleSheet("color: #dcdcaa; font-weight: bold;")
+        file_label.setObjectName("sectionLabel")
         file_layout.addWidget(file_label)
         
         # File path display and button
@@ -63,59 +146,33 @@ class CustomMeshTab(BaseTab):
         self.file_path_display = QLineEdit()
         self.file_path_display.setPlaceholderText("No file selected...")
         self.file_path_display.setReadOnly(True)
-        self.file_path_display.setStyleSheet("background: #1e1e1e; color: #cccccc; padding: 5px;")
+        self.file_path_display.setObjectName("filePath")
         
         browse_btn = QPushButton("Browse...")
         browse_btn.clicked.connect(self._on_browse_clicked)
-        browse_btn.setStyleSheet("""
-            QPushButton {
-                background: #0e639c;
-                color: white;
-                border: none;
-                padding: 5px 15px;
-                border-radius: 3px;
-            }
-            QPushButton:hover {
-                background: #1177bb;
-            }
-        """)
+        browse_btn.setObjectName("browseBtn")
         
         file_row.addWidget(self.file_path_display, 1)
         file_row.addWidget(browse_btn)
         file_layout.addLayout(file_row)
         
+        # Parse progress, shown while the file is being read
+        self.mesh_progress = QProgressBar()
+        self.mesh_progress.setVisible(False)
+        self.mesh_progress.setMaximumHeight(12)
+        self.mesh_progress.setTextVisible(False)
+        file_layout.addWidget(self.mesh_progress)
+        
+        # Mesh statistics, filled in once the file has been parsed
+        self.mesh_info = QLabel("")
+        self.mesh_info.setObjectName("meshInfo")
+        file_layout.addWidget(self.mesh_info)
+        
         scroll_layout.addWidget(file_widget)
         
         # Mesh transform parameters
         self.transform_params = ParameterWidget("Transform")
-        self.transform_params.add_float_parameter(
-            'mesh_scale', 'Scale:', default=1.0, min_val=0.1, max_val=10.0,
-            step=0.1, tooltip="Scale the mesh"
-        )
-        self.transform_params.add_slider_parameter(
-            'mesh_rotation_x', 'Rotation X:', default=0, min_val=0, max_val=360,
-            tooltip="Rotation around X axis (degrees)"
-        )
-        self.transform_params.add_slider_parameter(
-            'mesh_rotation_y', 'Rotation Y:', default=0, min_val=0, max_val=360,
-            tooltip="Rotation around Y axis (degrees)"
-        )
-        self.transform_params.add_slider_parameter(
-            'mesh_rotation_z', 'Rotation Z:', default=0, min_val=0, max_val=360,
-            tooltip="Rotation around Z axis (degrees)"
-        )
-        self.transform_params.add_float_parameter(
-            'mesh_pos_x', 'Position X:', default=0.0, min_val=-10.0, max_val=10.0,
-            step=0.1, tooltip="X position"
-        )
-        self.transform_params.add_float_parameter(
-            'mesh_pos_y', 'Position Y:', default=0.0, min_val=-10.0, max_val=10.0,
-            step=0.1, tooltip="Y position"
-        )
-        self.transform_params.add_float_parameter(
-            'mesh_pos_z', 'Position Z:', default=0.0, min_val=-10.0, max_val=10.0,
-            step=0.1, tooltip="Z position"
-        )
+        self.transform_params.add_many(TRANSFORM_SPECS)
         
         # Material parameters
         self.material_params = ParameterWidget("Material")
@@ -144,14 +201,7 @@ class CustomMeshTab(BaseTab):
         
         # Camera parameters
         self.camera_params = ParameterWidget("Camera")
-        self.camera_params.add_float_parameter(
-            'camera_distance', 'Distance:', default=5.0, min_val=1.0, max_val=20.0,
-            step=0.5, tooltip="Camera distance from origin"
-        )
-        self.camera_params.add_float_parameter(
-            'camera_height', 'Height:', default=2.0, min_val=-5.0, max_val=10.0,
-            step=0.5, tooltip="Camera height"
-        )
+        self.camera_params.add_many(CAMERA_SPECS)
         
         # Scene options
         self.scene_params = ParameterWidget("Scene Options")
@@ -168,6 +218,9 @@ class CustomMeshTab(BaseTab):
         
         scroll_layout.addWidget(self.transform_params)
         scroll_layout.addWidget(self.material_params)
+        # Camera version while its controls are untouched (see _set_camera_distance)
+        self._camera_default_version = self.camera_params.version
+        
         scroll_layout.addWidget(self.camera_params)
         scroll_layout.addWidget(self.scene_params)
         scroll_layout.addStretch()
@@ -186,53 +239,135 @@ class CustomMeshTab(BaseTab):
         
         if file_path:
             self.mesh_file_path = file_path
-            self.file_path_display.setText(file_path)
+            # Show the tail of long paths; the full path is in the tooltip
+            metrics = self.file_path_display.fontMetrics()
+            self.file_path_display.setText(metrics.elidedText(
+                file_path, Qt.TextElideMode.ElideLeft, self.file_path_display.width()))
+            self.file_path_display.setToolTip(file_path)
             logger.info(f"Selected mesh file: {file_path}")
+            
+            # Read the mesh off the GUI thread while parameters are adjusted
+            self._parsed_mesh = None
+            self._mesh_center = None
+            self.mesh_info.setText("Reading mesh...")
+            self.mesh_progress.setValue(0)
+            self.mesh_progress.setVisible(True)
+            task = MeshParseTask(file_path)
+            task.signals.progress.connect(self.mesh_progress.setValue)
+            task.signals.mesh_ready.connect(self._on_mesh_ready)
+            task.signals.mesh_failed.connect(self._on_mesh_failed)
+            QThreadPool.globalInstance().start(task)
     
-    def get_scene_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Build the custom mesh scene"""
-        if not self.mesh_file_path:
-            raise ValueError("Please select a mesh file first!")
-        
+    def _on_mesh_ready(self, path: str, mesh):
+        """Show statistics of a parsed mesh (ignored if another file was picked since)"""
+        if path != self.mesh_file_path:
+            return
+        self.mesh_progress.setVisible(False)
+        self._parsed_mesh = mesh
+        vertices, faces = mesh
+        if len(vertices):
+            # Bounds are computed once here, not on every render
+            lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+            self._mesh_center = tuple(float(c) for c in (lo + hi) * 0.5)
+            diagonal = float(((hi - lo) ** 2).sum() ** 0.5)
+            self._set_camera_distance(
+                2.5 * diagonal * self.transform_params.get_parameters()['mesh_scale'])
+            size = ", ".join(f"{extent:.3g}" for extent in hi - lo)
+        else:
+            size = "-"
+        self.mesh_info.setText(
+            f"{len(vertices):,} vertices, {len(faces):,} triangles, size ({size})")
+    
+    def _on_mesh_failed(self, path: str, error: str):
+        """Report a mesh that could not be read (Mitsuba may still load it)"""
+        if path != self.mesh_file_path:
+            return
+        self.mesh_progress.setVisible(False)
+        self.mesh_info.setText("Could not read mesh statistics")
+        logger.warning(f"Could not parse {path}: {error}")
+        self.log_message.emit(f"⚠️  Could not read mesh statistics: {error}")
+    
+    def _update_gen_params(self, width: int, height: int):
+        """Copy the controls' values into the CustomMeshGenerator parameters"""
         transform_params = self.transform_params.get_parameters()
         material_params = self.material_params.get_parameters()
         camera_params = self.camera_params.get_parameters()
         scene_params = self.scene_params.get_parameters()
         
+        # Slider values are percentages; scale by 1/100 once per value
+        pct = 0.01
+        
+        gen_params = self._gen_params
+        gen_params['width'] = width
+        gen_params['height'] = height
+        gen_params['mesh_file'] = self.mesh_file_path
+        gen_params['mesh_scale'] = transform_params['mesh_scale']
+        gen_params['mesh_rotation_x'] = float(transform_params['mesh_rotation_x'])
+        gen_params['mesh_rotation_y'] = float(transform_params['mesh_rotation_y'])
+        gen_params['mesh_rotation_z'] = float(transform_params['mesh_rotation_z'])
+        gen_params['mesh_position'] = (
+            transform_params['mesh_pos_x'],
+            transform_params['mesh_pos_y'],
+            transform_params['mesh_pos_z']
+        )
+        gen_params['camera_distance'] = camera_params['camera_distance']
+        gen_params['camera_height'] = camera_params['camera_height']
+        # Aim at the transformed bounds centre, so off-centre meshes are framed
+        if self._mesh_center is not None:
+            gen_params['camera_target'] = _mesh_to_world(
+                self._mesh_center, transform_params['mesh_scale'],
+                (transform_params['mesh_rotation_x'], transform_params['mesh_rotation_y'],
+                 transform_params['mesh_rotation_z']),
+                gen_params['mesh_position'])
+        else:
+            gen_params['camera_target'] = None
+        gen_params['material_type'] = material_params['material_type']
+        # Tuples, not reused lists: the generator puts the color straight
+        # into the scene dict, which must not change after it's returned
+        gen_params['material_color'] = (
+            material_params['color_r'] * pct,
+            material_params['color_g'] * pct,
+            material_params['color_b'] * pct
+        )
+        gen_params['roughness'] = material_params['roughness'] * pct
+        gen_params['use_ground'] = scene_params['use_ground']
+        gen_params['light_type'] = scene_params['light_type']
+    
+    def _set_camera_distance(self, distance: float):
+        """
+        Put a distance that frames the loaded mesh into the camera control
+        
+        Only done while the camera controls are untouched (or were last set
+        here), so a distance the user chose is kept when another mesh loads.
+        """
+        if distance <= 0 or self.camera_params.version != self._camera_default_version:
+            return
+        spinbox = self.camera_params.controls['camera_distance']
+        # Enough decimals to show tiny distances, and a range wide enough
+        # for very small or large meshes
+        spinbox.setDecimals(max(2, 2 - math.floor(math.log10(distance))))
+        spinbox.setRange(min(spinbox.minimum(), distance), max(spinbox.maximum(), distance))
+        self.camera_params.set_parameter('camera_distance', distance)
+        self._camera_default_version = self.camera_params.version
+    
+    def get_scene_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the custom mesh scene"""
+        if not self.mesh_file_path:
+            raise ValueError("Please select a mesh file first!")
+        
         width = params.get('width', 800)
         height = params.get('height', 600)
         
-        # Import the generator
-        from gui_examples.custom_mesh import CustomMeshGenerator
-        
-        # Build parameters
-        gen_params = {
-            'width': width,
-            'height': height,
-            'mesh_file': self.mesh_file_path,
-            'mesh_scale': transform_params['mesh_scale'],
-            'mesh_rotation_x': float(transform_params['mesh_rotation_x']),
-            'mesh_rotation_y': float(transform_params['mesh_rotation_y']),
-            'mesh_rotation_z': float(transform_params['mesh_rotation_z']),
-            'mesh_position': (
-                transform_params['mesh_pos_x'],
-                transform_params['mesh_pos_y'],
-                transform_params['mesh_pos_z']
-            ),
-            'camera_distance': camera_params['camera_distance'],
-            'camera_height': camera_params['camera_height'],
-            'material_type': material_params['material_type'],
-            'material_color': (
-                material_params['color_r'] / 100.0,
-                material_params['color_g'] / 100.0,
-                material_params['color_b'] / 100.0
-            ),
-            'roughness': material_params['roughness'] / 100.0,
-            'use_ground': scene_params['use_ground'],
-            'light_type': scene_params['light_type']
-        }
+        # Reuse the last generator parameters until a control or input changes
+        key = (width, height, self.mesh_file_path, self._mesh_center) + tuple(
+            widget.version for widget in
+            (self.transform_params, self.material_params, self.camera_params, self.scene_params)
+        )
+        if key != self._gen_params_key:
+            self._update_gen_params(width, height)
+            self._gen_params_key = key
         
-        scene_dict = CustomMeshGenerator.generate(gen_params)
+        scene_dict = _mesh_generator().generate(self._gen_params)
         
         logger.debug(f"Custom mesh scene generated for: {Path(self.mesh_file_path).name}")
         return scene_dict
@@ -6,17 +6,32 @@ from PyQt6.QtWidgets import QScrollArea, QWidget, QVBoxLayout, QLabel
 from PyQt6.QtCore import Qt
 from gui.tabs.base_tab import BaseTab
 from gui.widgets.parameter_widget import ParameterWidget
-from gui_examples.glass_demo import GlassDemoGenerator
+from functools import lru_cache
 from typing import Dict, Any
 from loguru import logger
 
 
+@lru_cache(maxsize=None)
+def _scene_generator():
+    """GlassDemoGenerator, imported and created on the first render"""
+    from gui_examples.glass_demo import GlassDemoGenerator
+    return GlassDemoGenerator()
+
+
 class GlassDemoTab(BaseTab):
     """Tab for experimenting with glass and transparent materials"""
     
     def __init__(self, parent=None):
-        self.scene_gen = GlassDemoGenerator()
         super().__init__("Glass & Transparency", parent)
+        # Generator parameters, updated in place by get_scene_dict() whenever
+        # their key (output size and control versions) changes
+        self._scene_params = {
+            'width': 0, 'height': 0,
+            'glass_type': '', 'glass_ior': 0.0, 'glass_tint': (1.0, 1.0, 1.0),
+            'light_intensity': 0.0, 'light_height': 0.0,
+            'background_type': '', 'show_caustics': True,
+        }
+        self._scene_params_key = None
     
     def setup_ui(self):
         """Setup the tab UI with parameter controls"""
@@ -36,11 +51,7 @@ class GlassDemoTab(BaseTab):
             "Requires more samples for clean results (512+ SPP recommended)"
         )
         info.setWordWrap(True)
-        info.setStyleSheet(
-            "color: #4ec9b0; padding: 10px; "
-            "background: #2d2d2d; border-radius: 5px; "
-            "line-height: 1.4;"
-        )
+        info.setObjectName("infoLabel")
         scroll_layout.addWidget(info)
         
         # Glass object selection
@@ -125,32 +136,52 @@ class GlassDemoTab(BaseTab):
         scroll.setWidget(scroll_widget)
         self.content_layout.addWidget(scroll)
     
-    def get_scene_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
-        """Build the scene dictionary from current parameters"""
+    def _update_scene_params(self, width: int, height: int):
+        """Copy the controls' values into the GlassDemoGenerator parameters"""
         object_params = self.object_params.get_parameters()
         glass_params = self.glass_params.get_parameters()
         tint_params = self.tint_params.get_parameters()
         light_params = self.light_params.get_parameters()
         bg_params = self.bg_params.get_parameters()
         
-        scene_params_dict = {
-            'width': params.get('width', 800),
-            'height': params.get('height', 600),
-            'glass_type': object_params['type'],
-            'glass_ior': glass_params['ior'],
-            'glass_tint': (
-                tint_params['tint_r'] / 100.0,
-                tint_params['tint_g'] / 100.0,
-                tint_params['tint_b'] / 100.0
-            ),
-            'light_intensity': float(light_params['intensity']),
-            'light_height': light_params['height'],
-            'background_type': bg_params['type'],
-            'show_caustics': bg_params['show_caustics'],
-        }
+        # Slider values are percentages; scale by 1/100 once per value
+        pct = 0.01
+        
+        scene_params = self._scene_params
+        scene_params['width'] = width
+        scene_params['height'] = height
+        scene_params['glass_type'] = object_params['type']
+        scene_params['glass_ior'] = glass_params['ior']
+        # A tuple, not a reused list: the generator compares it to (1, 1, 1)
+        scene_params['glass_tint'] = (
+            tint_params['tint_r'] * pct,
+            tint_params['tint_g'] * pct,
+            tint_params['tint_b'] * pct
+        )
+        scene_params['light_intensity'] = float(light_params['intensity'])
+        scene_params['light_height'] = light_params['height']
+        scene_params['background_type'] = bg_params['type']
+        scene_params['show_caustics'] = bg_params['show_caustics']
+    
+    def get_scene_dict(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the scene dictionary from current parameters"""
+        width = params.get('width', 800)
+        height = params.get('height', 600)
+        
+        # Reuse the last generator parameters until a control or input changes
+        key = (width, height) + tuple(
+            widget.version for widget in
+            (self.object_params, self.glass_params, self.tint_params,
+             self.light_params, self.bg_params)
+        )
+        if key != self._scene_params_key:
+            self._update_scene_params(width, height)
+            self._scene_params_key = key
         
-        logger.debug(f"Glass demo: type={object_params['type']}, IOR={glass_params['ior']}")
-        return self.scene_gen.generate(scene_params_dict)
+        scene_params_dict = self._scene_params
+        logger.debug("Glass demo: type={}, IOR={}",
+                     scene_params_dict['glass_type'], scene_params_dict['glass_ior'])
+        return _scene_generator().generate(scene_params_dict)
     
     def get_default_params(self) -> Dict[str, Any]:
         """Return default rendering parameters"""
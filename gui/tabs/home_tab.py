@@ -34,7 +34,7 @@ class HomeTab(BaseTab):
         welcome_layout = QVBoxLayout()
         
         title = QLabel("🎨 Mitsuba 3 Render Studio")
-        title.setStyleSheet("font-size: 24px; font-weight: bold; color: #4ec9b0; padding: 10px;")
+        title.setObjectName("homeTitle")
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
         
         description = QLabel(
@@ -47,7 +47,7 @@ class HomeTab(BaseTab):
             "• Dark Fusion theme for comfortable viewing\n\n"
             "Select a scene tab to get started!"
         )
-        description.setStyleSheet("color: #d4d4d4; padding: 10px; line-height: 1.6;")
+        description.setObjectName("homeDescription")
         description.setWordWrap(True)
         
         welcome_layout.addWidget(title)
@@ -136,6 +136,8 @@ class HomeTab(BaseTab):
     
     def get_current_settings(self) -> Dict[str, Any]:
         """Get current settings values"""
+        # May be asked for before the tab was ever shown
+        self.ensure_ui()
         return {
             'resolution': (self.width_spin.value(), self.height_spin.value()),
             'spp': self.spp_spin.value(),
@@ -57,7 +57,7 @@ class InverseRenderingTab(BaseTab):
             "• Neural implicit surfaces (NeRF-style)"
         )
         info.setWordWrap(True)
-        info.setStyleSheet("color: #ce9178; padding: 10px; background: #2d2d2d; border-radius: 5px;")
+        info.setObjectName("warningInfoLabel")
         scroll_layout.addWidget(info)
         
         # Variant check section
@@ -65,36 +65,18 @@ class InverseRenderingTab(BaseTab):
         check_layout = QVBoxLayout(check_widget)
         
         check_label = QLabel("Check Differentiable Variants:")
-        check_label.setStyleSheet("color: #dcdcaa; font-weight: bold;")
+        check_label.setObjectName("sectionLabel")
         check_layout.addWidget(check_label)
         
         check_btn = QPushButton("🔍 Check Available Variants")
         check_btn.clicked.connect(self._check_variants)
-        check_btn.setStyleSheet("""
-            QPushButton {
-                background: #0e639c;
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #1177bb;
-            }
-        """)
+        check_btn.setObjectName("checkBtn")
         check_layout.addWidget(check_btn)
         
         self.variant_output = QTextEdit()
         self.variant_output.setReadOnly(True)
         self.variant_output.setMaximumHeight(150)
-        self.variant_output.setStyleSheet("""
-            background: #1e1e1e;
-            color: #cccccc;
-            border: 1px solid #3c3c3c;
-            padding: 5px;
-            font-family: 'Consolas', 'Courier New', monospace;
-        """)
+        self.variant_output.setObjectName("variantOutput")
         self.variant_output.setPlaceholderText("Variant check results will appear here...")
         check_layout.addWidget(self.variant_output)
         
@@ -105,7 +87,7 @@ class InverseRenderingTab(BaseTab):
         demo_layout = QVBoxLayout(demo_widget)
         
         demo_label = QLabel("Run Inverse Rendering Examples:")
-        demo_label.setStyleSheet("color: #dcdcaa; font-weight: bold;")
+        demo_label.setObjectName("sectionLabel")
         demo_layout.addWidget(demo_label)
         
         demo_info = QLabel(
@@ -115,24 +97,12 @@ class InverseRenderingTab(BaseTab):
             "3. Light Estimation - Recover light source from shading"
         )
         demo_info.setWordWrap(True)
-        demo_info.setStyleSheet("color: #9cdcfe; padding: 5px;")
+        demo_info.setObjectName("noteLabel")
         demo_layout.addWidget(demo_info)
         
         demo_btn = QPushButton("▶️  Run Examples (Terminal)")
         demo_btn.clicked.connect(self._run_examples)
-        demo_btn.setStyleSheet("""
-            QPushButton {
-                background: #16825d;
-                color: white;
-                border: none;
-                padding: 8px 15px;
-                border-radius: 3px;
-                font-weight: bold;
-            }
-            QPushButton:hover {
-                background: #1a9e6d;
-            }
-        """)
+        demo_btn.setObjectName("runBtn")
         demo_layout.addWidget(demo_btn)
         
         scroll_layout.addWidget(demo_widget)
@@ -142,7 +112,7 @@ class InverseRenderingTab(BaseTab):
         docs_layout = QVBoxLayout(docs_widget)
         
         docs_label = QLabel("Documentation:")
-        docs_label.setStyleSheet("color: #dcdcaa; font-weight: bold;")
+        docs_label.setObjectName("sectionLabel")
         docs_layout.addWidget(docs_label)
         
         docs_info = QLabel(
@@ -157,7 +127,7 @@ class InverseRenderingTab(BaseTab):
             "• Troubleshooting"
         )
         docs_info.setWordWrap(True)
-        docs_info.setStyleSheet("color: #9cdcfe; padding: 5px;")
+        docs_info.setObjectName("noteLabel")
         docs_layout.addWidget(docs_info)
         
         scroll_layout.addWidget(docs_widget)
@@ -167,7 +137,7 @@ class InverseRenderingTab(BaseTab):
         interactive_layout = QVBoxLayout(interactive_widget)
         
         interactive_label = QLabel("Interactive Demo (Coming Soon):")
-        interactive_label.setStyleSheet("color: #dcdcaa; font-weight: bold;")
+        interactive_label.setObjectName("sectionLabel")
         interactive_layout.addWidget(interactive_label)
         
         interactive_info = QLabel(
@@ -179,7 +149,7 @@ class InverseRenderingTab(BaseTab):
             "Currently, please use the command-line examples."
         )
         interactive_info.setWordWrap(True)
-        interactive_info.setStyleSheet("color: #808080; padding: 5px; font-style: italic;")
+        interactive_info.setObjectName("placeholderLabel")
         interactive_layout.addWidget(interactive_info)
         
         scroll_layout.addWidget(interactive_widget)
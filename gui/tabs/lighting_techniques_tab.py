@@ -36,11 +36,7 @@ class LightingTechniquesTab(BaseTab):
             "Experiment with different setups to see how lighting affects mood!"
         )
         info.setWordWrap(True)
-        info.setStyleSheet(
-            "color: #4ec9b0; padding: 10px; "
-            "background: #2d2d2d; border-radius: 5px; "
-            "line-height: 1.4;"
-        )
+        info.setObjectName("infoLabel")
         scroll_layout.addWidget(info)
         
         # Lighting setup selection
@@ -34,7 +34,7 @@ class MaterialsShowcaseTab(BaseTab):
             "Adjust parameters to see how materials respond to light!"
         )
         info.setWordWrap(True)
-        info.setStyleSheet("color: #4ec9b0; padding: 10px; background: #2d2d2d; border-radius: 5px;")
+        info.setObjectName("infoLabel")
         scroll_layout.addWidget(info)
         
         # Lighting parameters
@@ -35,14 +35,17 @@ def setup_logger(log_dir: Optional[Path] = None) -> None:
         log_dir = Path(__file__).parent.parent.parent / "logs"
     log_dir.mkdir(exist_ok=True)
     
-    # Add file handler with rotation
+    # Add file handler with rotation. enqueue=True hands records to a
+    # background writer, so file I/O (and rotation/compression) never runs
+    # on the Qt thread. The GUI sink must stay synchronous: it updates widgets
     logger.add(
         log_dir / "mitsuba_gui_{time:YYYY-MM-DD}.log",
         format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
         level="DEBUG",
         rotation="10 MB",
         retention="7 days",
-        compression="zip"
+        compression="zip",
+        enqueue=True
     )
     
     logger.info("Logging system initialized")
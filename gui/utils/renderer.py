@@ -206,6 +206,7 @@ class MitsubaRenderer(QObject):
         super().__init__()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.process = None  # Only used by SubprocessRenderer
         self.current_worker = None
         self.current_thread = None
         self._is_rendering = False
@@ -274,6 +275,10 @@ class MitsubaRenderer(QObject):
             logger.info("Render cancelled by user")
             self.log_message.emit("❌ Render cancelled")
     
+    def cleanup(self):
+        """Clean up resources (call before exit)"""
+        self.cancel_render()
+    
     def _on_progress(self, value: int):
         """Handle progress updates"""
         self.progress_updated.emit(value)
@@ -33,6 +33,7 @@ class SubprocessRenderer(QObject):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
         self.process = None
+        self.current_worker = None  # Only used by the threaded MitsubaRenderer
         self.temp_files = []  # Track temp files for cleanup
         
         logger.info(f"SubprocessRenderer initialized, output: {self.output_dir}")
@@ -4,7 +4,7 @@ Log viewer widget with terminal-like appearance
 
 from PyQt6.QtWidgets import QTextEdit, QVBoxLayout, QWidget, QPushButton, QHBoxLayout
 from PyQt6.QtCore import pyqtSlot, Qt
-from PyQt6.QtGui import QTextCursor, QFont, QColor
+from PyQt6.QtGui import QTextCursor, QFont, QColor, QTextBlockFormat, QTextCharFormat
 from loguru import logger
 
 
@@ -26,21 +26,17 @@ class LogViewer(QWidget):
         self.text_edit.setReadOnly(True)
         self.text_edit.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
         
+        # One block per message; Qt drops the oldest blocks past max_lines
+        self.text_edit.document().setMaximumBlockCount(self.max_lines)
+        
         # Terminal-style font
         font = QFont("Consolas", 9)
         if not font.exactMatch():
             font = QFont("Courier New", 9)
         self.text_edit.setFont(font)
         
-        # Dark background for terminal feel
-        self.text_edit.setStyleSheet("""
-            QTextEdit {
-                background-color: #1e1e1e;
-                color: #d4d4d4;
-                border: 1px solid #3e3e3e;
-                padding: 5px;
-            }
-        """)
+        # Dark background for terminal feel (see dark.qss)
+        self.text_edit.setObjectName("logText")
         
         # Control buttons
         button_layout = QHBoxLayout()
@@ -77,16 +73,26 @@ class LogViewer(QWidget):
         Args:
             message: Log message (can contain HTML color tags)
         """
-        # Move cursor to end
-        cursor = self.text_edit.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        self.text_edit.setTextCursor(cursor)
+        self.append_logs((message,))
+    
+    def append_logs(self, messages):
+        """
+        Append several log messages in a single document edit
         
-        # Append message
-        self.text_edit.insertHtml(message + "<br>")
+        Args:
+            messages: Iterable of log messages (can contain HTML color tags)
+        """
+        doc = self.text_edit.document()
+        cursor = QTextCursor(doc)
+        cursor.movePosition(QTextCursor.MoveOperation.End)
         
-        # Limit lines
-        self._limit_lines()
+        cursor.beginEditBlock()
+        for message in messages:
+            # Each message gets its own block, with the default formatting
+            if not doc.isEmpty():
+                cursor.insertBlock(QTextBlockFormat(), QTextCharFormat())
+            cursor.insertHtml(message)
+        cursor.endEditBlock()
         
         # Auto-scroll to bottom
         if self.auto_scroll:
@@ -94,15 +100,6 @@ class LogViewer(QWidget):
                 self.text_edit.verticalScrollBar().maximum()
             )
     
-    def _limit_lines(self):
-        """Keep only the last max_lines"""
-        doc = self.text_edit.document()
-        while doc.blockCount() > self.max_lines:
-            cursor = QTextCursor(doc.firstBlock())
-            cursor.select(QTextCursor.SelectionType.BlockUnderCursor)
-            cursor.removeSelectedText()
-            cursor.deleteChar()  # Remove the newline
-    
     @pyqtSlot()
     def clear(self):
         """Clear all log messages"""
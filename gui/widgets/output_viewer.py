@@ -53,18 +53,13 @@ class OutputViewer(QWidget):
         # Info label
         self.info_label = QLabel("No image loaded")
         self.info_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.info_label.setStyleSheet("color: #888; padding: 5px;")
+        self.info_label.setObjectName("imageInfo")
         
         # Scroll area for image
         self.scroll_area = QScrollArea()
         self.scroll_area.setWidgetResizable(True)
         self.scroll_area.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        self.scroll_area.setStyleSheet("""
-            QScrollArea {
-                background-color: #2d2d2d;
-                border: 1px solid #3e3e3e;
-            }
-        """)
+        self.scroll_area.setObjectName("imageArea")
         
         # Image label
         self.image_label = QLabel()
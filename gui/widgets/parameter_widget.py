@@ -7,8 +7,8 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox, QComboBox, QLineEdit, QCheckBox,
     QGroupBox, QSlider, QLabel, QHBoxLayout
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from typing import Dict, Any
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
+from typing import Dict, Any, Iterable, Tuple
 from loguru import logger
 
 
@@ -20,10 +20,25 @@ class ParameterWidget(QWidget):
     
     parameters_changed = pyqtSignal(dict)  # Emits parameter dict when values change
     
+    # Quiet period before parameters_changed is emitted, so a slider drag
+    # produces one signal instead of one per step. Nothing in the app listens
+    # to the signal yet (renders read get_parameters() on demand); this only
+    # saves rebuilding the parameter dict on every step
+    DEBOUNCE_MS = 150
+    
     def __init__(self, title: str = "Parameters", parent=None):
         super().__init__(parent)
         self.title = title
         self.controls = {}
+        # Last get_parameters() result; cleared whenever a control changes
+        self._cache = None
+        # Bumped on every change, so callers can memoize values derived
+        # from get_parameters() and compare versions to invalidate them
+        self.version = 0
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(self.DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._emit_changes)
         self._setup_ui()
     
     def _setup_ui(self):
@@ -54,10 +69,9 @@ class ParameterWidget(QWidget):
         spinbox.setMaximum(max_val)
         spinbox.setValue(default)
         spinbox.setToolTip(tooltip)
-        spinbox.valueChanged.connect(lambda: self._emit_changes())
+        spinbox.valueChanged.connect(lambda: self._on_control_changed())
         
-        self.controls[name] = spinbox
-        self.form_layout.addRow(label, spinbox)
+        self._add_control(name, label, spinbox, spinbox)
     
     def add_float_parameter(
         self, 
@@ -78,10 +92,9 @@ class ParameterWidget(QWidget):
         spinbox.setDecimals(decimals)
         spinbox.setSingleStep(step)
         spinbox.setToolTip(tooltip)
-        spinbox.valueChanged.connect(lambda: self._emit_changes())
+        spinbox.valueChanged.connect(lambda: self._on_control_changed())
         
-        self.controls[name] = spinbox
-        self.form_layout.addRow(label, spinbox)
+        self._add_control(name, label, spinbox, spinbox)
     
     def add_slider_parameter(
         self,
@@ -107,13 +120,12 @@ class ParameterWidget(QWidget):
         value_label.setMinimumWidth(40)
         
         slider.valueChanged.connect(lambda v: value_label.setText(str(v)))
-        slider.valueChanged.connect(lambda: self._emit_changes())
+        slider.valueChanged.connect(lambda: self._on_control_changed())
         
         layout.addWidget(slider)
         layout.addWidget(value_label)
         
-        self.controls[name] = slider
-        self.form_layout.addRow(label, container)
+        self._add_control(name, label, slider, container)
     
     def add_choice_parameter(
         self, 
@@ -129,10 +141,9 @@ class ParameterWidget(QWidget):
         if default and default in choices:
             combobox.setCurrentText(default)
         combobox.setToolTip(tooltip)
-        combobox.currentTextChanged.connect(lambda: self._emit_changes())
+        combobox.currentTextChanged.connect(lambda: self._on_control_changed())
         
-        self.controls[name] = combobox
-        self.form_layout.addRow(label, combobox)
+        self._add_control(name, label, combobox, combobox)
     
     def add_bool_parameter(
         self, 
@@ -145,10 +156,9 @@ class ParameterWidget(QWidget):
         checkbox = QCheckBox()
         checkbox.setChecked(default)
         checkbox.setToolTip(tooltip)
-        checkbox.stateChanged.connect(lambda: self._emit_changes())
+        checkbox.stateChanged.connect(lambda: self._on_control_changed())
         
-        self.controls[name] = checkbox
-        self.form_layout.addRow(label, checkbox)
+        self._add_control(name, label, checkbox, checkbox)
     
     def add_string_parameter(
         self, 
@@ -161,13 +171,52 @@ class ParameterWidget(QWidget):
         lineedit = QLineEdit()
         lineedit.setText(default)
         lineedit.setToolTip(tooltip)
-        lineedit.textChanged.connect(lambda: self._emit_changes())
+        lineedit.textChanged.connect(lambda: self._on_control_changed())
+        
+        self._add_control(name, label, lineedit, lineedit)
+    
+    def add_many(self, specs: Iterable[Tuple[str, str, str, Dict[str, Any]]]):
+        """
+        Add several parameters in one pass
         
-        self.controls[name] = lineedit
-        self.form_layout.addRow(label, lineedit)
+        Args:
+            specs: (kind, name, label, kwargs) tuples, where kind is one of
+                'int', 'float', 'slider', 'choice', 'bool', 'string' and
+                kwargs are passed on to the matching add_*_parameter()
+        """
+        adders = {
+            'int': self.add_int_parameter,
+            'float': self.add_float_parameter,
+            'slider': self.add_slider_parameter,
+            'choice': self.add_choice_parameter,
+            'bool': self.add_bool_parameter,
+            'string': self.add_string_parameter,
+        }
+        # Lay the form out once, after all rows are in
+        self.setUpdatesEnabled(False)
+        try:
+            for kind, name, label, kwargs in specs:
+                adders[kind](name, label, **kwargs)
+        finally:
+            self.setUpdatesEnabled(True)
+    
+    def _add_control(self, name: str, label: str, control: QWidget, row: QWidget):
+        """Register a control and add its row (the control or its container)"""
+        self.controls[name] = control
+        self._cache = None
+        self.version += 1
+        self.form_layout.addRow(label, row)
     
     def get_parameters(self) -> Dict[str, Any]:
-        """Get current parameter values as dictionary"""
+        """
+        Get current parameter values as dictionary
+        
+        The values are read from the controls only after something changed;
+        otherwise a copy of the previous result is returned.
+        """
+        if self._cache is not None:
+            return dict(self._cache)
+        
         params = {}
         
         for name, control in self.controls.items():
@@ -182,7 +231,8 @@ class ParameterWidget(QWidget):
             elif isinstance(control, QLineEdit):
                 params[name] = control.text()
         
-        return params
+        self._cache = params
+        return dict(params)
     
     def set_parameter(self, name: str, value: Any):
         """Set a parameter value programmatically"""
@@ -208,6 +258,12 @@ class ParameterWidget(QWidget):
         # This would require storing defaults - can be implemented if needed
         logger.debug("Reset to defaults requested")
     
+    def _on_control_changed(self):
+        """Invalidate the cached values now; signal the change once it settles"""
+        self._cache = None
+        self.version += 1
+        self._debounce.start()
+    
     def _emit_changes(self):
         """Emit signal when parameters change"""
         params = self.get_parameters()
@@ -2,9 +2,38 @@
 Custom Mesh Loader - Load and render OBJ, PLY, STL files
 """
 
-from typing import Dict, Any
+import io
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Dict, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
+# PLY property types -> NumPy type codes (byte order is added per file)
+PLY_TYPES = {
+    'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1',
+    'short': 'i2', 'int16': 'i2', 'ushort': 'u2', 'uint16': 'u2',
+    'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+    'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8',
+}
+
+# Parsed meshes, keyed by (path, mtime); the least recently used is dropped
+# once more than MESH_CACHE_SIZE are held. Tasks may parse concurrently
+MESH_CACHE_SIZE = 4
+_mesh_cache = OrderedDict()
+_mesh_cache_lock = threading.Lock()
+
+# Line batches the OBJ reader thread may queue ahead of the parser
+STREAM_QUEUE_SIZE = 4
+
+# One binary STL triangle: normal, three vertices, attribute byte count
+STL_TRIANGLE = np.dtype([('normal', '<f4', 3), ('v', '<f4', (3, 3)), ('attr', '<u2')])
+
 
 class CustomMeshGenerator:
     """Generate scene with custom 3D mesh file"""
@@ -23,8 +52,9 @@ class CustomMeshGenerator:
             mesh_rotation_y: float - Rotation around Y axis (degrees)
             mesh_rotation_z: float - Rotation around Z axis (degrees)
             mesh_position: tuple - (x, y, z) position
-            camera_distance: float - Distance from origin
+            camera_distance: float - Distance from origin (or camera_target)
             camera_height: float - Camera height
+            camera_target: tuple - Point to look at and orbit (optional)
             material_type: str - Material type (diffuse, conductor, dielectric, plastic)
             material_color: tuple - RGB color (0-1) for diffuse/plastic
             roughness: float - Material roughness (0-1)
@@ -50,6 +80,14 @@ class CustomMeshGenerator:
         # Camera
         camera_distance = params.get('camera_distance', 5.0)
         camera_height = params.get('camera_height', 2.0)
+        camera_target = params.get('camera_target')
+        if camera_target is None:
+            camera_origin = [camera_distance * 0.707, -camera_distance * 0.707, camera_height]
+            camera_target = [0, 0, mesh_pos[2]]
+        else:
+            tx, ty, tz = camera_target
+            camera_origin = [tx + camera_distance * 0.707, ty - camera_distance * 0.707, tz + camera_height]
+            camera_target = [tx, ty, tz]
         
         # Material
         material_type = params.get('material_type', 'diffuse')
@@ -105,8 +143,8 @@ class CustomMeshGenerator:
                 'fov': 45,
                 'to_world': {
                     'type': 'look_at',
-                    'origin': [camera_distance * 0.707, -camera_distance * 0.707, camera_height],
-                    'target': [0, 0, mesh_pos[2]],
+                    'origin': camera_origin,
+                    'target': camera_target,
                     'up': [0, 0, 1]
                 },
                 'film': {
@@ -166,6 +204,300 @@ class CustomMeshGenerator:
         
         return scene_dict
     
+    @staticmethod
+    def parse_only(
+        mesh_file: str,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Read a mesh file's geometry without building a scene
+        
+        The render itself loads the file through Mitsuba's plugins; this is
+        for inspecting a mesh (counts, bounds) in the GUI process. The last
+        MESH_CACHE_SIZE results are cached by path and modification time.
+        
+        Args:
+            mesh_file: OBJ, PLY or STL file
+            progress: Called with the percentage parsed so far (OBJ only,
+                see stream_load())
+        
+        Returns:
+            (vertices, faces): float32 array of shape (N, 3) and int64
+            array of shape (M, 3) of zero-based triangle vertex indices
+        """
+        path = str(mesh_file)
+        key = (path, os.path.getmtime(path))
+        with _mesh_cache_lock:
+            if key in _mesh_cache:
+                _mesh_cache.move_to_end(key)
+                return _mesh_cache[key]
+        
+        extension = Path(path).suffix.lower()
+        if extension == '.ply':
+            mesh = CustomMeshGenerator._parse_ply(path)
+        elif extension == '.stl':
+            mesh = CustomMeshGenerator._parse_stl(path)
+        else:
+            mesh = CustomMeshGenerator.stream_load(path, progress=progress)
+        
+        with _mesh_cache_lock:
+            _mesh_cache[key] = mesh
+            if len(_mesh_cache) > MESH_CACHE_SIZE:
+                _mesh_cache.popitem(last=False)
+        return mesh
+    
+    @staticmethod
+    def _triangulate(indices: np.ndarray, counts: np.ndarray) -> np.ndarray:
+        """
+        Fan-triangulate polygons given as one flat index array
+        
+        Args:
+            indices: Vertex indices of all polygons, back to back
+            counts: Number of vertices of each polygon
+        """
+        if (counts == 3).all():
+            return indices.reshape(-1, 3).astype(np.int64, copy=False)
+        
+        # Skip points and lines; triangle t of a polygon starting at s is
+        # (s, s + t + 1, s + t + 2)
+        keep = counts >= 3
+        poly_starts = (np.cumsum(counts) - counts)[keep]
+        tris_per_poly = counts[keep] - 2
+        starts = np.repeat(poly_starts, tris_per_poly)
+        first_tri = np.repeat(np.cumsum(tris_per_poly) - tris_per_poly, tris_per_poly)
+        corner = starts + np.arange(len(starts)) - first_tri + 1
+        return np.stack([indices[starts], indices[corner], indices[corner + 1]], axis=1).astype(np.int64)
+    
+    @staticmethod
+    def stream_load(
+        path: str,
+        chunk_lines: int = 65536,
+        progress: Optional[Callable[[int], None]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Parse an OBJ file chunk by chunk while it is still being read
+        
+        A reader thread queues batches of chunk_lines lines (at most
+        STREAM_QUEUE_SIZE batches ahead), and the calling thread converts
+        each batch to arrays as it arrives, so disk reads overlap parsing
+        and only a few batches of raw text are held at a time.
+        
+        Args:
+            path: OBJ file to read
+            chunk_lines: Lines per batch
+            progress: Called with the percentage of the file parsed so far
+        
+        Returns:
+            (vertices, faces) as from parse_only()
+        """
+        size = max(os.path.getsize(path), 1)
+        batches = queue.Queue(maxsize=STREAM_QUEUE_SIZE)
+        # Set when the caller stops consuming (e.g. on a parse error), so the
+        # reader doesn't block forever on a full queue with the file open
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def read():
+            try:
+                with io.BufferedReader(io.FileIO(path, 'r'), 1 << 20) as f:
+                    while True:
+                        lines = list(islice(f, chunk_lines))
+                        if not lines:
+                            break
+                        if not put((lines, f.tell())):
+                            return
+                put(None)
+            except Exception as e:
+                put(e)
+        
+        reader = threading.Thread(target=read, daemon=True)
+        reader.start()
+        
+        vertex_chunks, face_chunks = [], []
+        vertex_count, percent = 0, -1
+        try:
+            while True:
+                batch = batches.get()
+                if batch is None:
+                    break
+                if isinstance(batch, Exception):
+                    raise batch
+                lines, position = batch
+                
+                vertices, faces = CustomMeshGenerator._parse_obj_lines(lines, vertex_count)
+                vertex_chunks.append(vertices)
+                face_chunks.append(faces)
+                vertex_count += len(vertices)
+                
+                if progress is not None and position * 100 // size != percent:
+                    percent = position * 100 // size
+                    progress(percent)
+        finally:
+            stop.set()
+            reader.join()
+        
+        vertices = np.concatenate(vertex_chunks) if vertex_chunks else np.empty((0, 3), dtype=np.float32)
+        faces = np.concatenate(face_chunks) if face_chunks else np.empty((0, 3), dtype=np.int64)
+        return vertices, faces
+    
+    @staticmethod
+    def _parse_obj_lines(lines, vertex_offset: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vertices and (fan-triangulated) faces of a batch of OBJ lines
+        
+        Args:
+            lines: Raw lines (bytes) of the file
+            vertex_offset: Number of vertices in the lines before this batch
+        """
+        vertex_lines, face_lines, face_base = [], [], []
+        for line in lines:
+            if line.startswith(b'v '):
+                vertex_lines.append(line)
+            elif line.startswith(b'f '):
+                face_lines.append(line)
+                face_base.append(vertex_offset + len(vertex_lines))
+        
+        # Bulk conversion of the collected lines in NumPy's C parser
+        vertices = np.loadtxt(vertex_lines, usecols=(1, 2, 3), dtype=np.float32, ndmin=2) \
+            if vertex_lines else np.empty((0, 3), dtype=np.float32)
+        
+        # 'f v/vt/vn ...': keep the vertex index of each corner
+        rows = [line.split()[1:] for line in face_lines]
+        counts = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+        tokens = b' '.join(b' '.join(row) for row in rows)
+        tokens = re.sub(rb'/\S*', b'', tokens).split()
+        indices = np.array(tokens, dtype=np.int64) if tokens else np.empty(0, dtype=np.int64)
+        
+        # 1-based indices; negative ones count back from the last vertex so far
+        base = np.repeat(np.array(face_base, dtype=np.int64), counts)
+        indices = np.where(indices > 0, indices - 1, base + indices)
+        return vertices, CustomMeshGenerator._triangulate(indices, counts)
+    
+    @staticmethod
+    def _parse_stl(path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Triangle soup of an ASCII or binary STL file"""
+        size = os.path.getsize(path)
+        with open(path, 'rb') as f:
+            header = f.read(84)
+            count = int.from_bytes(header[80:84], 'little') if len(header) == 84 else -1
+            
+            # Binary STL: 80-byte header, uint32 count, 50 bytes per triangle
+            if size == 84 + STL_TRIANGLE.itemsize * count:
+                triangles = np.fromfile(f, dtype=STL_TRIANGLE, count=count)
+                vertices = triangles['v'].reshape(-1, 3)
+            else:
+                f.seek(0)
+                lines = [line for line in f if line.lstrip().startswith(b'vertex')]
+                vertices = np.loadtxt(lines, usecols=(1, 2, 3), dtype=np.float32, ndmin=2) \
+                    if lines else np.empty((0, 3), dtype=np.float32)
+        
+        return vertices, np.arange(len(vertices), dtype=np.int64).reshape(-1, 3)
+    
+    @staticmethod
+    def _parse_ply(path: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Vertex positions and (fan-triangulated) faces of a PLY file"""
+        with open(path, 'rb') as f:
+            if f.readline().strip() != b'ply':
+                raise ValueError(f"Not a PLY file: {path}")
+            
+            # Header: format line, then elements with their properties
+            fmt, elements = None, []
+            while True:
+                line = f.readline()
+                if not line:
+                    raise ValueError(f"Truncated PLY header: {path}")
+                parts = line.decode('ascii', 'replace').split()
+                if not parts or parts[0] in ('comment', 'obj_info'):
+                    continue
+                if parts[0] == 'end_header':
+                    break
+                if parts[0] == 'format':
+                    fmt = parts[1]
+                elif parts[0] == 'element':
+                    elements.append((parts[1], int(parts[2]), []))
+                elif parts[0] == 'property':
+                    # ('list', count type, item type, name) or (type, name)
+                    prop = tuple(parts[1:5]) if parts[1] == 'list' else (parts[1], parts[2])
+                    elements[-1][2].append(prop)
+            
+            if fmt == 'ascii':
+                return CustomMeshGenerator._parse_ply_ascii(f, elements)
+            endian = '<' if fmt == 'binary_little_endian' else '>'
+            return CustomMeshGenerator._parse_ply_binary(f, elements, endian)
+    
+    @staticmethod
+    def _parse_ply_ascii(f, elements) -> Tuple[np.ndarray, np.ndarray]:
+        """Body of an ASCII PLY file (one element instance per line)"""
+        vertices = np.empty((0, 3), dtype=np.float32)
+        faces = np.empty((0, 3), dtype=np.int64)
+        for name, count, props in elements:
+            lines = [f.readline() for _ in range(count)]
+            if name == 'vertex':
+                names = [prop[-1] for prop in props]
+                columns = [names.index(axis) for axis in ('x', 'y', 'z')]
+                vertices = np.loadtxt(lines, usecols=columns, dtype=np.float32, ndmin=2) \
+                    if lines else vertices
+            elif name == 'face':
+                # The vertex index list is the first property of a face
+                rows = [line.split() for line in lines]
+                counts = np.array([int(row[0]) for row in rows], dtype=np.int64)
+                tokens = [token for row in rows for token in row[1:int(row[0]) + 1]]
+                indices = np.array(tokens, dtype=np.int64) if tokens else np.empty(0, dtype=np.int64)
+                faces = CustomMeshGenerator._triangulate(indices, counts)
+        return vertices, faces
+    
+    @staticmethod
+    def _parse_ply_binary(f, elements, endian: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Body of a binary PLY file, read one element block at a time"""
+        vertices = np.empty((0, 3), dtype=np.float32)
+        faces = np.empty((0, 3), dtype=np.int64)
+        for name, count, props in elements:
+            lists = [prop for prop in props if prop[0] == 'list']
+            if not lists:
+                # Fixed-size records: the whole element is a single read
+                dtype = np.dtype([(prop[1], endian + PLY_TYPES[prop[0]]) for prop in props])
+                data = np.fromfile(f, dtype=dtype, count=count)
+                if name == 'vertex':
+                    vertices = np.stack([data['x'], data['y'], data['z']], axis=1).astype(np.float32)
+            elif name == 'face' and len(props) == 1:
+                faces = CustomMeshGenerator._read_ply_faces(f, props[0], count, endian)
+            else:
+                raise ValueError(f"Unsupported PLY element layout: {name} {props}")
+        return vertices, faces
+    
+    @staticmethod
+    def _read_ply_faces(f, prop, count: int, endian: str) -> np.ndarray:
+        """Binary PLY face list, read in one go when every face is a triangle"""
+        _, count_type, item_type, _ = prop
+        count_dtype = np.dtype(endian + PLY_TYPES[count_type])
+        item_dtype = np.dtype(endian + PLY_TYPES[item_type])
+        
+        # Common case first: all faces are triangles
+        start = f.tell()
+        triangle = np.dtype([('n', count_dtype), ('v', item_dtype, 3)])
+        data = np.fromfile(f, dtype=triangle, count=count)
+        if len(data) == count and (data['n'] == 3).all():
+            return data['v'].astype(np.int64)
+        
+        # Mixed polygons: walk the records to find each one's length
+        f.seek(start)
+        counts = np.empty(count, dtype=np.int64)
+        chunks = []
+        for i in range(count):
+            n = int(np.frombuffer(f.read(count_dtype.itemsize), count_dtype)[0])
+            counts[i] = n
+            chunks.append(f.read(n * item_dtype.itemsize))
+        indices = np.frombuffer(b''.join(chunks), dtype=item_dtype).astype(np.int64)
+        return CustomMeshGenerator._triangulate(indices, counts)
+    
     @staticmethod
     def _create_mesh_shape(mesh_file: str, transform: Dict[str, Any], bsdf: Dict[str, Any]) -> Dict[str, Any]:
         """Create mesh shape with correct plugin type based on file extension"""
@@ -33,41 +33,35 @@ def main():
         # Create main window
         window = MainWindow()
         
-        # Add scene tabs in progressive learning order
+        # Add scene tabs in progressive learning order. Tab classes are
+        # passed as factories: each tab is built when first opened
         
         # 1. Basic fundamentals
-        basic_tab = BasicSceneTab()
-        window.add_scene_tab(basic_tab, "Basic Scene", "🔮")
+        window.add_scene_tab(BasicSceneTab, "Basic Scene", "🔮")
         
         # 2. Material comparison
-        materials_tab = MaterialsShowcaseTab()
-        window.add_scene_tab(materials_tab, "Materials", "💎")
+        window.add_scene_tab(MaterialsShowcaseTab, "Materials", "💎")
         
         # 3. Lighting techniques
-        lighting_tab = LightingTechniquesTab()
-        window.add_scene_tab(lighting_tab, "Lighting", "💡")
+        window.add_scene_tab(LightingTechniquesTab, "Lighting", "💡")
         
         # 4. Glass and transparency
-        glass_tab = GlassDemoTab()
-        window.add_scene_tab(glass_tab, "Glass", "🔬")
+        window.add_scene_tab(GlassDemoTab, "Glass", "🔬")
         
         # 5. Global illumination
-        cornell_tab = CornellBoxTab()
-        window.add_scene_tab(cornell_tab, "Cornell Box", "📦")
+        window.add_scene_tab(CornellBoxTab, "Cornell Box", "📦")
         
         # 6. Custom mesh loading
-        custom_mesh_tab = CustomMeshTab()
-        window.add_scene_tab(custom_mesh_tab, "Custom Mesh", "🎨")
+        window.add_scene_tab(CustomMeshTab, "Custom Mesh", "🎨")
         
         # 7. Inverse rendering (2D→3D)
-        inverse_tab = InverseRenderingTab()
-        window.add_scene_tab(inverse_tab, "Inverse Rendering", "🔄")
+        window.add_scene_tab(InverseRenderingTab, "Inverse Rendering", "🔄")
         
         # Show window
         window.show()
         
         logger.info("GUI launched successfully")
-        logger.info("7 scene tabs loaded: Basic → Materials → Lighting → Glass → Cornell Box → Custom Mesh → Inverse Rendering")
+        logger.info("7 scene tabs registered: Basic → Materials → Lighting → Glass → Cornell Box → Custom Mesh → Inverse Rendering")
         logger.info("Select a scene tab and adjust parameters to render")
         
         # Start event loop